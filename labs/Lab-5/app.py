@@ -8,47 +8,126 @@ reason through them step-by-step.
 Requirements: 4.1, 4.2, 4.3, 4.4
 """
 
+import collections
+import uuid
+
 import streamlit as st
 from reasoning_agent.reasoning_agent import ReasoningAgent
-from reasoning_agent.utils import format_final_answer
+from reasoning_agent.types import Message
+from reasoning_agent.utils import format_final_answer, is_valid_input
+
+# Maximum number of conversation turns kept in session state. Each turn is
+# a user message plus an assistant reply, so the history deque holds at
+# most MAX_TURNS * 2 entries and silently evicts the oldest beyond that.
+# Without a cap, session-state memory grows without bound in long-running
+# sessions.
+MAX_TURNS = 50
+
+
+@st.cache_resource(ttl=3600, max_entries=100)
+def get_agent(session_id: str) -> ReasoningAgent:
+    """
+    Build one ReasoningAgent per session, with eviction.
+
+    Streamlit reruns the whole script on every interaction; without caching,
+    each rerun would rebuild the agent and its OpenAI client, throwing away
+    the warm HTTP connection pool. Keying the cache on the session id and
+    bounding it with ttl/max_entries means idle sessions release their
+    agent (Streamlit never cleans session state when a tab closes), while
+    active sessions keep reusing warm keep-alive connections.
+
+    Args:
+        session_id: Opaque per-session cache key
+
+    Returns:
+        The session's ReasoningAgent instance
+
+    Requirements: 4.1
+    """
+    return ReasoningAgent()
+
+
+def current_agent():
+    """
+    Get this session's agent from the resource cache.
+
+    Looked up on every rerun rather than stored in session state - a
+    session-state reference would pin the object and defeat the cache's
+    TTL/LRU eviction.
+
+    Returns:
+        The session's ReasoningAgent, or None if initialization failed
+        (e.g. missing API key)
+    """
+    try:
+        return get_agent(st.session_state["_sid"])
+    except ValueError as e:
+        st.error(f"Error initializing agent: {e}")
+        return None
 
 
 def initialize_session_state():
     """
     Initialize Streamlit session state for message history.
-    
+
     Creates session state variables if they don't exist:
-    - messages: List of chat messages with role and content
-    - reasoning_agent: Instance of ReasoningAgent
-    
+    - messages: Bounded deque of chat messages with role and content
+    - _sid: Opaque session id used as the agent-cache key
+
     Requirements: 4.1
     """
     if "messages" not in st.session_state:
-        st.session_state.messages = []
-    
-    if "reasoning_agent" not in st.session_state:
-        try:
-            st.session_state.reasoning_agent = ReasoningAgent()
-        except ValueError as e:
-            st.error(f"Error initializing agent: {e}")
-            st.session_state.reasoning_agent = None
+        # Bounded ring buffer: appending past maxlen drops the oldest
+        # message, capping per-session memory for long conversations
+        st.session_state.messages = collections.deque(maxlen=MAX_TURNS * 2)
+
+    if "_sid" not in st.session_state:
+        st.session_state["_sid"] = uuid.uuid4().hex
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _render_history_markdown(history: tuple) -> str:
+    """
+    Render the chat history to a single markdown string, memoized.
+
+    Streamlit reruns the whole script on every interaction, and creating
+    one widget per message makes each rerun O(N) in conversation length.
+    Rendering the history as one markdown blob keyed on its (role, content)
+    tuples means the string is rebuilt only when the history actually
+    changes; unchanged reruns are a cache lookup. max_entries keeps the
+    cache from accreting one full-conversation string per interaction
+    per session - only each session's latest history ever hits, so a
+    handful of entries is plenty.
+
+    Args:
+        history: Tuple of (role, content) pairs, oldest first
+
+    Returns:
+        Markdown for the whole conversation
+    """
+    blocks = [
+        f"**{'You' if role == 'user' else 'Assistant'}:**\n\n{content}"
+        for role, content in history
+    ]
+    return "\n\n---\n\n".join(blocks)
 
 
 def display_message_history():
     """
-    Display the chat message history using Streamlit chat components.
-    
-    Iterates through session state messages and displays them using
-    st.chat_message() for proper formatting and styling.
-    
+    Display the chat message history.
+
+    Renders the whole history as one memoized markdown block instead of one
+    st.chat_message widget per message, keeping rerun cost constant for
+    long conversations.
+
     Requirements: 4.2
     """
-    for message in st.session_state.messages:
-        role = message.get("role", "user")
-        content = message.get("content", "")
-        
-        with st.chat_message(role):
-            st.markdown(content)
+    if not st.session_state.messages:
+        return
+    history = tuple(
+        (m.role, m.content) for m in st.session_state.messages
+    )
+    st.markdown(_render_history_markdown(history))
 
 
 def process_user_problem(problem: str):
@@ -69,15 +148,13 @@ def process_user_problem(problem: str):
     
     Requirements: 4.3, 4.4
     """
-    if not st.session_state.reasoning_agent:
+    agent = current_agent()
+    if not agent:
         st.error("Reasoning agent not initialized. Please check your API key.")
         return
     
     # Add user message to chat history
-    st.session_state.messages.append({
-        "role": "user",
-        "content": problem
-    })
+    st.session_state.messages.append(Message(role="user", content=problem))
     
     # Display user message in the chat interface
     with st.chat_message("user"):
@@ -85,66 +162,74 @@ def process_user_problem(problem: str):
     
     # Process through reasoning agent and display results
     with st.chat_message("assistant"):
+        # AGENTIC FLOW: Stream the reasoning loop
+        # Tokens are displayed as the model produces them, so the user sees
+        # reasoning text at first-token latency instead of waiting for the
+        # whole multi-iteration loop to finish. The final structured solution
+        # is captured from the event stream for the step-by-step summary.
+        solution_holder = {}
+
+        def _token_stream():
+            for event in agent.stream_reasoning_loop(
+                problem=problem,
+                messages=[]
+            ):
+                if event["type"] == "token":
+                    yield event["text"]
+                elif event["type"] == "solution":
+                    solution_holder["solution"] = event["solution"]
+
+        st.write_stream(_token_stream())
+        solution = solution_holder.get("solution", {})
+
         # Create a container for reasoning steps
         steps_container = st.container()
-        
-        # AGENTIC FLOW: Call the reasoning agent
-        # This runs the iterative reasoning loop internally
-        solution = st.session_state.reasoning_agent.run_reasoning_loop(
-            problem=problem,
-            messages=[]
-        )
-        
-        # Display the reasoning steps and results
+
+        # Display the reasoning steps and results.
+        # Each st.markdown call creates a widget with non-trivial per-call
+        # overhead; a 10-step solution would emit up to 40 of them. Building
+        # the whole summary as one list of lines and rendering it with a
+        # single st.markdown keeps widget count constant regardless of step
+        # count, and the joined blob is reused verbatim for the chat history.
+        lines = ["### Reasoning Steps"]
+        for step in solution.get("steps", []):
+            step_num = step.get("step_number", 0)
+            reasoning = step.get("reasoning", "")
+            tool_name = step.get("tool_name")
+            tool_input = step.get("tool_input")
+            tool_result = step.get("tool_result")
+
+            lines.append(f"**Step {step_num}:** {reasoning}")
+
+            # If a tool was called, include the tool information
+            if tool_name:
+                lines.append(f"  - Tool: `{tool_name}`")
+                if tool_input:
+                    lines.append(f"  - Input: {tool_input}")
+                if tool_result:
+                    lines.append(f"  - Result: `{tool_result}`")
+
+        # Final answer with clear visual separation
+        final_answer = solution.get("final_answer", "Unable to determine answer")
+        lines.append("---")
+        lines.append(f"### Final Answer\n{final_answer}")
+
+        assistant_response = "\n\n".join(lines)
         with steps_container:
-            st.markdown("### Reasoning Steps")
-            
-            # Display each reasoning step
-            for step in solution.get("steps", []):
-                step_num = step.get("step_number", 0)
-                reasoning = step.get("reasoning", "")
-                tool_name = step.get("tool_name")
-                tool_input = step.get("tool_input")
-                tool_result = step.get("tool_result")
-                
-                # Display the reasoning for this step
-                st.markdown(f"**Step {step_num}:** {reasoning}")
-                
-                # If a tool was called, display the tool information
-                if tool_name:
-                    st.markdown(f"  - Tool: `{tool_name}`")
-                    if tool_input:
-                        st.markdown(f"  - Input: {tool_input}")
-                    if tool_result:
-                        st.markdown(f"  - Result: `{tool_result}`")
-            
-            # Display final answer with clear visual separation
-            final_answer = solution.get("final_answer", "Unable to determine answer")
-            st.markdown("---")
-            st.markdown(f"### Final Answer\n{final_answer}")
-            
-            # Display metadata about the solution
+            st.markdown(assistant_response)
+
+            # Metadata about the solution, as one blob inside one expander
             total_iterations = solution.get("total_iterations", 0)
             tools_used = solution.get("tools_used", [])
-            
-            # Collapsible section for detailed solution information
             with st.expander("Solution Details"):
-                st.markdown(f"**Total Iterations:** {total_iterations}")
-                st.markdown(f"**Tools Used:** {', '.join(tools_used) if tools_used else 'None'}")
-    
-    # Add assistant response to history
-    assistant_response = f"""### Reasoning Steps
-{chr(10).join([f"**Step {step.get('step_number')}:** {step.get('reasoning', '')}" for step in solution.get('steps', [])])}
+                st.markdown(
+                    f"**Total Iterations:** {total_iterations}\n\n"
+                    f"**Tools Used:** {', '.join(tools_used) if tools_used else 'None'}"
+                )
 
----
-
-### Final Answer
-{solution.get('final_answer', 'Unable to determine answer')}"""
-    
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": assistant_response
-    })
+    st.session_state.messages.append(
+        Message(role="assistant", content=assistant_response)
+    )
 
 
 def main():
@@ -190,11 +275,12 @@ def main():
     with col2:
         # Clear conversation button
         if st.button("Clear History", key="clear_button"):
-            st.session_state.messages = []
+            st.session_state.messages = collections.deque(maxlen=MAX_TURNS * 2)
             st.rerun()
     
-    # Process user input
-    if user_input:
+    # Process user input (skip empty/whitespace-only without allocating
+    # a stripped copy)
+    if user_input and is_valid_input(user_input):
         process_user_problem(user_input)
 
 
@@ -0,0 +1,42 @@
+"""
+Shared pytest configuration for the Lab-5 test suite.
+
+Registers a Hypothesis settings profile tuned for this suite's
+deterministic property tests: the example database and shrinking phase
+are pure overhead here (failures reproduce immediately from fixed mock
+data), and the default deadline can flake on cold-cache first runs.
+
+Also isolates the agent's persistent response cache: with diskcache
+installed, ReasoningAgent writes to ~/.reasoning_agent/cache by
+default, and the suite's clear_cache() calls would wipe the
+developer's real cached solutions (while xdist workers raced on the
+shared directory). Tests get a per-run temp directory instead.
+"""
+
+import os
+
+import pytest
+from hypothesis import Phase, settings
+
+settings.register_profile(
+    "lab5",
+    database=None,              # skip .hypothesis/ disk I/O and file locking
+    deadline=None,              # avoid flakes from cold-cache first examples
+    phases=(Phase.generate,),   # nothing to shrink or replay in these tests
+)
+settings.load_profile("lab5")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_response_cache(tmp_path_factory):
+    """
+    Point REASONING_CACHE_DIR at a per-session temp directory.
+
+    Every ReasoningAgent built by the tests then persists (and clears)
+    its diskcache there, never in the developer's home directory. Under
+    pytest-xdist each worker gets its own temp dir, so workers don't
+    share cache files either.
+    """
+    os.environ["REASONING_CACHE_DIR"] = str(
+        tmp_path_factory.mktemp("reasoning-cache")
+    )
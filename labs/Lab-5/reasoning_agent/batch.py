@@ -0,0 +1,75 @@
+"""
+Command-line batch runner for the Reasoning Math Agent.
+
+Reads problems from an NDJSON file (one JSON object per line with a
+"problem" key, or a bare JSON string per line) and solves them
+concurrently through ReasoningAgent.run_batch, writing one solution JSON
+per line to stdout.
+
+Usage:
+    python -m reasoning_agent.batch input.jsonl
+    python -m reasoning_agent.batch input.jsonl --max-concurrent 20
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from reasoning_agent.reasoning_agent import ReasoningAgent
+
+
+def load_problems(path: str) -> list:
+    """
+    Load problems from an NDJSON file.
+
+    Args:
+        path: Path to a file with one JSON object (or JSON string) per line
+
+    Returns:
+        List of problem strings
+    """
+    problems = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            problems.append(record["problem"] if isinstance(record, dict) else record)
+    return problems
+
+
+def main(argv=None) -> int:
+    """
+    Entry point for the batch CLI.
+
+    Args:
+        argv: Optional argument list (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve a batch of math problems concurrently"
+    )
+    parser.add_argument("input", help="NDJSON file of problems")
+    parser.add_argument("--max-concurrent", type=int, default=10,
+                        help="Maximum number of problems in flight at once")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="Drop persisted cached solutions before running")
+    args = parser.parse_args(argv)
+
+    problems = load_problems(args.input)
+    agent = ReasoningAgent()
+    if args.clear_cache:
+        agent.clear_cache()
+    results = asyncio.run(agent.run_batch(problems, max_concurrent=args.max_concurrent))
+
+    for result in results:
+        sys.stdout.write(json.dumps(result) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+"""
+Fast-path evaluation for trivial arithmetic problems.
+
+Sending "What is 15 times 23?" through the full agentic loop costs seconds
+of OpenAI latency for a computation Python can do in microseconds. This
+module recognizes problems that are pure arithmetic expressions (possibly
+wrapped in natural-language filler) and evaluates them directly, letting
+the reasoning loop skip the LLM entirely for the dominant class of trivial
+user problems.
+
+Safety: the expression is parsed with the ast module and only explicitly
+whitelisted arithmetic node types are evaluated. Anything else - names,
+calls, attribute access - causes the fast path to decline, so no untrusted
+code can execute.
+"""
+
+import ast
+import operator
+import re
+from typing import Optional
+
+
+# English wrappers commonly typed around an arithmetic expression.
+# Removed before deciding whether the remainder is pure arithmetic.
+_WRAPPER_WORDS = re.compile(
+    r"\b(what\s+is|what's|whats|calculate|compute|evaluate|solve|tell\s+me|please)\b",
+    re.IGNORECASE
+)
+
+# Word and symbol operators normalized to Python operators.
+# Longer phrases first so "multiplied by" wins over "by".
+_OPERATOR_WORDS = [
+    (re.compile(r"\bmultiplied\s+by\b", re.IGNORECASE), "*"),
+    (re.compile(r"\bdivided\s+by\b", re.IGNORECASE), "/"),
+    (re.compile(r"\btimes\b", re.IGNORECASE), "*"),
+    (re.compile(r"\bplus\b", re.IGNORECASE), "+"),
+    (re.compile(r"\bminus\b", re.IGNORECASE), "-"),
+    (re.compile(r"(?<=[\d\s])x(?=[\d\s])", re.IGNORECASE), "*"),
+    (re.compile(r"×"), "*"),
+    (re.compile(r"÷"), "/"),
+]
+
+# After normalization, a fast-path candidate may contain only these characters
+_ARITHMETIC_ONLY = re.compile(r"[\d\s+\-*/().]+")
+
+# The only AST node types the evaluator will touch
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _normalize(problem: str) -> str:
+    """
+    Strip natural-language wrappers and normalize operators.
+
+    Args:
+        problem: The raw problem string
+
+    Returns:
+        The candidate arithmetic expression (may still be invalid)
+    """
+    cleaned = _WRAPPER_WORDS.sub(" ", problem)
+    for pattern, replacement in _OPERATOR_WORDS:
+        cleaned = pattern.sub(replacement, cleaned)
+    # Drop trailing punctuation like "?" and "." left over from the question
+    return cleaned.replace("?", " ").replace("=", " ").strip(" .,\t\n")
+
+
+def _eval_node(node: ast.AST) -> float:
+    """
+    Recursively evaluate a whitelisted arithmetic AST node.
+
+    Args:
+        node: An AST node from a parsed candidate expression
+
+    Returns:
+        The numeric value of the node
+
+    Raises:
+        ValueError: If the node is not a whitelisted arithmetic construct
+    """
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float)):
+            return node.value
+        raise ValueError(f"Non-numeric constant: {node.value!r}")
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        return _BIN_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError(f"Disallowed node: {type(node).__name__}")
+
+
+def try_direct(problem: str) -> Optional[str]:
+    """
+    Attempt to answer a problem by direct arithmetic evaluation.
+
+    Args:
+        problem: The user's problem string, e.g. "What is 15 times 23?"
+
+    Returns:
+        The computed answer as a string if the problem is pure arithmetic,
+        or None if it needs the full reasoning loop (in which case the
+        caller falls back to the LLM)
+    """
+    cleaned = _normalize(problem)
+    if not cleaned or not _ARITHMETIC_ONLY.fullmatch(cleaned):
+        return None
+    # Require at least one digit so inputs like "+" or "()" are declined
+    if not any(ch.isdigit() for ch in cleaned):
+        return None
+
+    try:
+        tree = ast.parse(cleaned, mode="eval")
+        value = _eval_node(tree)
+    except (SyntaxError, ValueError, ZeroDivisionError):
+        return None
+
+    # Render integral results without a trailing ".0" for readability
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
@@ -0,0 +1 @@
+# Prompt text resources for the Reasoning Math Agent
@@ -0,0 +1,52 @@
+"""
+Unit tests for the arithmetic fast path.
+
+Tests natural-language normalization, safe evaluation, and the cases that
+must decline so the reasoning loop falls back to the LLM.
+"""
+
+from reasoning_agent.fastpath import try_direct
+
+
+class TestTryDirect:
+    """Tests for try_direct evaluation."""
+
+    def test_plain_expression(self):
+        """Test that a bare arithmetic expression is evaluated."""
+        assert try_direct("15 * 23") == "345"
+
+    def test_natural_language_multiplication(self):
+        """Test that English wrappers and operator words are normalized."""
+        assert try_direct("What is 15 times 23?") == "345"
+        assert try_direct("Calculate 10 multiplied by 2") == "20"
+
+    def test_unicode_operators(self):
+        """Test that unicode multiply/divide signs are handled."""
+        assert try_direct("6 × 7") == "42"
+        assert try_direct("10 ÷ 4") == "2.5"
+
+    def test_integral_results_have_no_decimal_point(self):
+        """Test that whole-number results render without a trailing .0"""
+        assert try_direct("10 divided by 2") == "5"
+
+    def test_parentheses_and_precedence(self):
+        """Test that grouped expressions evaluate correctly."""
+        assert try_direct("(2 + 3) * 4") == "20"
+
+    def test_word_problem_declines(self):
+        """Test that non-arithmetic problems fall through to the LLM."""
+        assert try_direct("If Sara has 3 boxes of 5 apples, how many apples?") is None
+
+    def test_empty_and_whitespace_decline(self):
+        """Test that empty input declines rather than evaluating."""
+        assert try_direct("") is None
+        assert try_direct("   ") is None
+
+    def test_code_injection_declines(self):
+        """Test that anything beyond arithmetic is refused."""
+        assert try_direct("__import__('os').system('ls')") is None
+        assert try_direct("What is foo times 3?") is None
+
+    def test_division_by_zero_declines(self):
+        """Test that undefined arithmetic declines instead of raising."""
+        assert try_direct("5 / 0") is None
@@ -8,506 +8,662 @@ Property-based tests for the reasoning loop engine.
 **Feature: reasoning-math-agent, Property 5: Reasoning Loop Termination**
 **Feature: reasoning-math-agent, Property 7: Tool Result Integration**
 **Feature: reasoning-math-agent, Property 8: Tool Usage Tracking**
+
+The seven properties share one skeleton: configure mock responses, run the
+loop, assert on the result. They are expressed here as assertion functions
+applied to shared scenarios, so each (problem, response sequence) pair runs
+the agent exactly once no matter how many properties it validates.
 """
 
-from hypothesis import given, strategies as st, settings
-from unittest.mock import Mock, patch, MagicMock
+import functools
+import pytest
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from openai import OpenAI
 from reasoning_agent.reasoning_agent import ReasoningAgent
-import json
+from reasoning_agent.utils import iter_tool_steps
+
+
+# Tool argument payloads, written out by hand so not even a one-time
+# json.dumps runs at import. These match json.dumps exactly (sorted keys,
+# default separators).
+_ARGS_5_3 = '{"a": 5, "b": 3}'
+_ARGS_15_2 = '{"a": 15, "b": 2}'
+
+
+@functools.lru_cache(maxsize=None)
+def _resp(content, tool_calls=None):
+    """
+    Build a lightweight chat-completion response object.
+
+    The reasoning loop only reads .choices[0].message.content and
+    .tool_calls, so a plain SimpleNamespace tree is enough. MagicMock
+    auto-creates tracked child mocks on every attribute access, which is
+    wasted work for pure-data responses; caching by (content, tool_calls)
+    means each unique response is built exactly once per run.
+
+    Args:
+        content: The assistant message text
+        tool_calls: Optional tuple of tool-call namespaces (tuple so the
+            cache key is hashable)
+
+    Returns:
+        A response namespace shaped like a ChatCompletion
+    """
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(content=content, tool_calls=tool_calls)
+        )]
+    )
 
 
-# Strategy for generating simple math problems
-math_problems = st.just("What is 5 times 3?") | st.just("Calculate 10 multiplied by 2") | st.just("What is 7 times 8?")
+# Hashable so tool calls can appear in _resp's cache key
+# (SimpleNamespace defines __eq__ without __hash__ and cannot)
+_Function = namedtuple("_Function", ["name", "arguments"])
+_ToolCall = namedtuple("_ToolCall", ["id", "type", "function"])
 
 
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_problem_acceptance_and_processing(problem):
+@functools.lru_cache(maxsize=None)
+def _tool_call(call_id, name, arguments):
+    """
+    Build a lightweight tool-call object for mock responses.
+
+    Args:
+        call_id: The tool call id (e.g. "call_1")
+        name: Tool name (e.g. "multiply")
+        arguments: JSON-encoded argument string
+
+    Returns:
+        A hashable record shaped like a ChatCompletionMessageToolCall
+    """
+    return _ToolCall(id=call_id, type="function", function=_Function(name=name, arguments=arguments))
+
+
+# Tool calls and response sequences are static data, so build each one once
+# at import instead of on every test invocation. side_effect consumes its
+# iterable, so the runner passes a list(...) copy of these tuples.
+_CALL_5_3 = _tool_call("call_1", "multiply", _ARGS_5_3)
+_CALL_15_2 = _tool_call("call_2", "multiply", _ARGS_15_2)
+
+_SINGLE_STEP_RESPONSES = (
+    _resp("I will solve this step by step."),
+)
+_SEQUENTIAL_RESPONSES = (
+    _resp("I need to analyze this problem."),
+    _resp("Let me work through the calculation."),
+    _resp("The answer is 15.")
+)
+_FINAL_ANSWER_RESPONSES = (
+    _resp("Let me analyze this problem."),
+    _resp("The final answer is 15.")
+)
+_TOOL_RESPONSES = (
+    _resp("I need to multiply 5 and 3.", (_CALL_5_3,)),
+    _resp("The result of 5 times 3 is 15.")
+)
+_TWO_TOOL_RESPONSES = (
+    _resp("I'll multiply 5 and 3.", (_CALL_5_3,)),
+    _resp("Now I'll multiply the result by 2.", (_CALL_15_2,)),
+    _resp("The final answer is 30.")
+)
+
+# The full input space of the old Hypothesis strategy: three fixed problems.
+# With a finite, tiny domain, parametrize runs each case exactly once with
+# none of Hypothesis's shrinking/database bookkeeping.
+MATH_PROBLEMS = (
+    "What is 5 times 3?",
+    "Calculate 10 multiplied by 2",
+    "What is 7 times 8?",
+)
+
+# Every field a reasoning step must carry. One frozenset difference per
+# step replaces seven per-key membership asserts.
+REQUIRED_STEP_FIELDS = frozenset({
+    "step_number",
+    "reasoning",
+    "tool_called",
+    "tool_name",
+    "tool_input",
+    "tool_result",
+    "is_final",
+})
+
+
+@pytest.fixture(scope="module")
+def mock_openai():
+    """
+    Patch the OpenAI client class once for the whole module.
+
+    Entering and exiting patch() inside every test body pays importlib
+    attribute lookup, MagicMock construction, and teardown on every
+    invocation. Patching at module scope does that work once; the scenario
+    runner just resets the shared client and re-configures side_effect.
+    """
+    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
+        # spec= restricts attributes to the real client surface, catching
+        # typos at test time and skipping MagicMock's create-on-demand
+        # __getattr__ path for unknown names.
+        client = MagicMock(spec=OpenAI)
+        mock_openai_class.return_value = client
+        yield client
+
+
+@pytest.fixture(scope="module")
+def agent(mock_openai):
+    """
+    Construct one ReasoningAgent for the whole module.
+
+    __init__ builds HTTP clients and loads tool schemas; repeating that on
+    every test invocation buys nothing since the OpenAI client is mocked.
+    The autouse reset fixture below clears the mutable state between tests.
+    """
+    return ReasoningAgent(api_key="test-key")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_agent_state(agent):
+    """Reset the shared agent's caches and plan templates before each test."""
+    agent._reset()
+
+
+def _check_problem_acceptance(result, problem):
     """
     Property 1: Problem Acceptance and Processing
-    
-    *For any* valid math problem string, submitting it to the reasoning agent 
-    should initiate the reasoning process and produce a non-empty list of 
+
+    *For any* valid math problem string, submitting it to the reasoning agent
+    should initiate the reasoning process and produce a non-empty list of
     reasoning steps.
-    
+
     **Validates: Requirements 1.1**
     """
-    # Mock the OpenAI client to simulate reasoning
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock response that simulates the agent processing the problem
-        response = MagicMock()
-        response.choices[0].message.content = "I will solve this step by step."
-        response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.return_value = response
-        
-        # Run the reasoning loop with the problem
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify the problem was accepted
-        assert result["problem"] == problem, \
-            f"Problem not preserved: expected '{problem}', got '{result['problem']}'"
-        
-        # Verify reasoning process initiated and produced steps
-        assert len(result["steps"]) > 0, \
-            "No reasoning steps were produced - reasoning process did not initiate"
-        
-        # Verify each step has content
-        for step in result["steps"]:
-            assert step["reasoning"] is not None, \
-                "Reasoning step has no content"
-            assert step["step_number"] > 0, \
-                "Step number is invalid"
-        
-        # Verify a final answer was produced
-        assert result["final_answer"] is not None, \
-            "No final answer was produced"
-        assert result["final_answer"] != "", \
-            "Final answer is empty"
-
-
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_sequential_reasoning_steps(problem):
+    # Verify the problem was accepted
+    assert result["problem"] == problem, \
+        f"Problem not preserved: expected '{problem}', got '{result['problem']}'"
+
+    # Verify reasoning process initiated and produced steps
+    assert len(result["steps"]) > 0, \
+        "No reasoning steps were produced - reasoning process did not initiate"
+
+    # Verify each step has content
+    for step in result["steps"]:
+        assert step["reasoning"] is not None, \
+            "Reasoning step has no content"
+        assert step["step_number"] > 0, \
+            "Step number is invalid"
+
+    # Verify a final answer was produced
+    assert result["final_answer"] is not None, \
+        "No final answer was produced"
+    assert result["final_answer"] != "", \
+        "Final answer is empty"
+
+
+def _check_sequential_steps(result, problem):
     """
     Property 2: Sequential Reasoning Steps
-    
-    *For any* completed reasoning solution, the reasoning steps should be 
-    numbered sequentially starting from 1 with no gaps, and each step should 
+
+    *For any* completed reasoning solution, the reasoning steps should be
+    numbered sequentially starting from 1 with no gaps, and each step should
     contain reasoning content.
-    
+
     **Validates: Requirements 1.2**
     """
-    # Mock the OpenAI client to simulate reasoning
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock responses that simulate multiple reasoning steps
-        # Step 1: Agent analyzes the problem
-        step1_response = MagicMock()
-        step1_response.choices[0].message.content = "I need to analyze this problem."
-        step1_response.choices[0].message.tool_calls = None
-        
-        # Step 2: Agent provides reasoning
-        step2_response = MagicMock()
-        step2_response.choices[0].message.content = "Let me work through the calculation."
-        step2_response.choices[0].message.tool_calls = None
-        
-        # Step 3: Agent provides final answer
-        step3_response = MagicMock()
-        step3_response.choices[0].message.content = "The answer is 15."
-        step3_response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.side_effect = [
-            step1_response, 
-            step2_response, 
-            step3_response
-        ]
-        
-        # Run the reasoning loop
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify steps exist
-        assert len(result["steps"]) > 0, \
-            "No reasoning steps were produced"
-        
-        # Verify steps are numbered sequentially starting from 1
-        for i, step in enumerate(result["steps"], start=1):
-            assert step["step_number"] == i, \
-                f"Step numbering is not sequential: expected step {i}, got step {step['step_number']}"
-        
-        # Verify no gaps in step numbering
-        step_numbers = [step["step_number"] for step in result["steps"]]
-        expected_numbers = list(range(1, len(result["steps"]) + 1))
-        assert step_numbers == expected_numbers, \
-            f"Gaps in step numbering: got {step_numbers}, expected {expected_numbers}"
-        
-        # Verify each step has content
-        for i, step in enumerate(result["steps"], start=1):
-            assert step["reasoning"] is not None, \
-                f"Step {i} has no reasoning content"
-            assert step["reasoning"] != "", \
-                f"Step {i} has empty reasoning content"
-            assert isinstance(step["reasoning"], str), \
-                f"Step {i} reasoning is not a string"
-
-
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_final_answer_presence(problem):
+    # Verify steps exist
+    assert len(result["steps"]) > 0, \
+        "No reasoning steps were produced"
+
+    # Verify steps are numbered sequentially starting from 1
+    for i, step in enumerate(result["steps"], start=1):
+        assert step["step_number"] == i, \
+            f"Step numbering is not sequential: expected step {i}, got step {step['step_number']}"
+
+    # Verify no gaps in step numbering
+    step_numbers = [step["step_number"] for step in result["steps"]]
+    expected_numbers = list(range(1, len(result["steps"]) + 1))
+    assert step_numbers == expected_numbers, \
+        f"Gaps in step numbering: got {step_numbers}, expected {expected_numbers}"
+
+    # Verify each step has content
+    for i, step in enumerate(result["steps"], start=1):
+        assert step["reasoning"] is not None, \
+            f"Step {i} has no reasoning content"
+        assert step["reasoning"] != "", \
+            f"Step {i} has empty reasoning content"
+        assert isinstance(step["reasoning"], str), \
+            f"Step {i} reasoning is not a string"
+
+
+def _check_final_answer(result, problem):
     """
     Property 3: Final Answer Presence
-    
-    *For any* completed reasoning solution, the output should contain a final 
+
+    *For any* completed reasoning solution, the output should contain a final
     answer field that is non-empty and distinct from intermediate reasoning steps.
-    
+
     **Validates: Requirements 1.3**
     """
-    # Mock the OpenAI client to simulate reasoning
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock responses that simulate reasoning with a final answer
-        # Step 1: Agent analyzes the problem
-        step1_response = MagicMock()
-        step1_response.choices[0].message.content = "Let me analyze this problem."
-        step1_response.choices[0].message.tool_calls = None
-        
-        # Step 2: Agent provides final answer
-        step2_response = MagicMock()
-        step2_response.choices[0].message.content = "The final answer is 15."
-        step2_response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.side_effect = [
-            step1_response, 
-            step2_response
-        ]
-        
-        # Run the reasoning loop
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify final answer field exists
-        assert "final_answer" in result, \
-            "Result does not contain 'final_answer' field"
-        
-        # Verify final answer is non-empty
-        assert result["final_answer"] is not None, \
-            "Final answer is None"
-        assert result["final_answer"] != "", \
-            "Final answer is empty string"
-        assert isinstance(result["final_answer"], str), \
-            "Final answer is not a string"
-        
-        # Verify final answer is distinct from intermediate steps
-        # The final answer should not be identical to any intermediate step
-        intermediate_steps = [step["reasoning"] for step in result["steps"][:-1]]
-        
-        # The final answer should be different from intermediate reasoning
-        # (unless there's only one step, in which case it's both)
-        if len(result["steps"]) > 1:
-            # For multi-step solutions, final answer should be distinct
-            assert result["final_answer"] != intermediate_steps[0] or len(intermediate_steps) == 0, \
-                "Final answer is identical to first intermediate step"
-        
-        # Verify final answer has meaningful content (not just whitespace)
-        assert result["final_answer"].strip() != "", \
-            "Final answer contains only whitespace"
-
-
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_complete_solution_preservation(problem):
+    # Verify final answer field exists
+    assert "final_answer" in result, \
+        "Result does not contain 'final_answer' field"
+
+    # Verify final answer is non-empty
+    assert result["final_answer"] is not None, \
+        "Final answer is None"
+    assert result["final_answer"] != "", \
+        "Final answer is empty string"
+    assert isinstance(result["final_answer"], str), \
+        "Final answer is not a string"
+
+    # Verify final answer is distinct from intermediate steps
+    # The final answer should not be identical to any intermediate step
+    intermediate_steps = [step["reasoning"] for step in result["steps"][:-1]]
+
+    # The final answer should be different from intermediate reasoning
+    # (unless there's only one step, in which case it's both)
+    if len(result["steps"]) > 1:
+        # For multi-step solutions, final answer should be distinct
+        assert result["final_answer"] != intermediate_steps[0] or len(intermediate_steps) == 0, \
+            "Final answer is identical to first intermediate step"
+
+    # Verify final answer has meaningful content (not just whitespace)
+    assert result["final_answer"].strip() != "", \
+        "Final answer contains only whitespace"
+
+
+def _check_solution_preservation(result, problem):
     """
     Property 4: Complete Solution Preservation
-    
-    *For any* math problem processed by the agent, the solution output should 
-    contain all reasoning steps that were generated, preserving the complete 
+
+    *For any* math problem processed by the agent, the solution output should
+    contain all reasoning steps that were generated, preserving the complete
     thought process from problem to answer.
-    
+
     **Validates: Requirements 1.4**
     """
-    # Mock the OpenAI client to simulate reasoning with multiple steps
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock tool call object
-        tool_call = MagicMock()
-        tool_call.id = "call_1"
-        tool_call.function.name = "multiply"
-        tool_call.function.arguments = json.dumps({"a": 5, "b": 3})
-        
-        # Create mock responses that simulate multiple reasoning steps
-        # Step 1: Agent analyzes the problem
-        step1_response = MagicMock()
-        step1_response.choices[0].message.content = "I need to multiply 5 and 3."
-        step1_response.choices[0].message.tool_calls = [tool_call]
-        
-        # Step 2: Agent uses tool result and provides answer
-        step2_response = MagicMock()
-        step2_response.choices[0].message.content = "The result of 5 times 3 is 15."
-        step2_response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.side_effect = [
-            step1_response, 
-            step2_response
-        ]
-        
-        # Run the reasoning loop
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify all reasoning steps are preserved
-        assert len(result["steps"]) > 0, \
-            "No reasoning steps were preserved"
-        
-        # Verify each step has the required fields
-        for step in result["steps"]:
-            assert "step_number" in step, \
-                "Step missing step_number field"
-            assert "reasoning" in step, \
-                "Step missing reasoning field"
-            assert "tool_called" in step, \
-                "Step missing tool_called field"
-            assert "tool_name" in step, \
-                "Step missing tool_name field"
-            assert "tool_input" in step, \
-                "Step missing tool_input field"
-            assert "tool_result" in step, \
-                "Step missing tool_result field"
-            assert "is_final" in step, \
-                "Step missing is_final field"
-        
-        # Verify the complete thought process is maintained
-        # The first step should contain the initial reasoning
-        assert result["steps"][0]["reasoning"] is not None, \
-            "First step reasoning is missing"
-        assert result["steps"][0]["reasoning"] != "", \
-            "First step reasoning is empty"
-        
-        # Verify tool calls are preserved in steps
-        tool_steps = [step for step in result["steps"] if step["tool_called"]]
-        if len(tool_steps) > 0:
-            # If tools were used, verify they're recorded
-            for tool_step in tool_steps:
-                assert tool_step["tool_name"] is not None, \
-                    "Tool name not preserved in step"
-                assert tool_step["tool_result"] is not None, \
-                    "Tool result not preserved in step"
-        
-        # Verify the final answer is present and distinct
-        assert result["final_answer"] is not None, \
-            "Final answer not preserved"
-        assert result["final_answer"] != "", \
-            "Final answer is empty"
-        
-        # Verify the problem statement is preserved
-        assert result["problem"] == problem, \
-            "Problem statement not preserved"
-        
-        # Verify all steps are accounted for in the output
-        # The number of steps should match what was generated
-        assert len(result["steps"]) >= 1, \
-            "Not all reasoning steps were preserved"
-        
-        # Verify no step content is lost or truncated
-        for i, step in enumerate(result["steps"]):
-            assert isinstance(step["reasoning"], str), \
-                f"Step {i} reasoning is not a string"
-            assert len(step["reasoning"]) > 0, \
-                f"Step {i} reasoning content is empty"
-
-
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_reasoning_loop_termination(problem):
+    # Verify all reasoning steps are preserved
+    assert len(result["steps"]) > 0, \
+        "No reasoning steps were preserved"
+
+    # Verify each step has the required fields (one set difference per
+    # step instead of seven membership checks)
+    for step in result["steps"]:
+        missing = REQUIRED_STEP_FIELDS - step.keys()
+        assert not missing, f"Step missing fields: {missing}"
+
+    # Verify the complete thought process is maintained
+    # The first step should contain the initial reasoning
+    assert result["steps"][0]["reasoning"] is not None, \
+        "First step reasoning is missing"
+    assert result["steps"][0]["reasoning"] != "", \
+        "First step reasoning is empty"
+
+    # Verify tool calls are preserved in steps
+    tool_steps = list(iter_tool_steps(result["steps"]))
+    if len(tool_steps) > 0:
+        # If tools were used, verify they're recorded
+        for tool_step in tool_steps:
+            assert tool_step["tool_name"] is not None, \
+                "Tool name not preserved in step"
+            assert tool_step["tool_result"] is not None, \
+                "Tool result not preserved in step"
+
+    # Verify the final answer is present and distinct
+    assert result["final_answer"] is not None, \
+        "Final answer not preserved"
+    assert result["final_answer"] != "", \
+        "Final answer is empty"
+
+    # Verify the problem statement is preserved
+    assert result["problem"] == problem, \
+        "Problem statement not preserved"
+
+    # Verify all steps are accounted for in the output
+    # The number of steps should match what was generated
+    assert len(result["steps"]) >= 1, \
+        "Not all reasoning steps were preserved"
+
+    # Verify no step content is lost or truncated
+    assert all(isinstance(s["reasoning"], str) and s["reasoning"] for s in result["steps"]), \
+        "A step's reasoning content is missing, empty, or not a string"
+
+
+def _check_termination(result, problem):
     """
     Property 5: Reasoning Loop Termination
-    
-    *For any* math problem, the reasoning loop should eventually terminate 
+
+    *For any* math problem, the reasoning loop should eventually terminate
     with a final answer within a maximum of 10 iterations, preventing infinite loops.
-    
+
     **Validates: Requirements 3.2, 3.4**
     """
-    # Mock the OpenAI client to simulate reasoning
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock tool call object
-        tool_call = MagicMock()
-        tool_call.id = "call_1"
-        tool_call.function.name = "multiply"
-        tool_call.function.arguments = json.dumps({"a": 5, "b": 3})
-        
-        # Create mock responses that simulate the reasoning loop
-        # First response: agent decides to use multiplication tool
-        first_response = MagicMock()
-        first_response.choices[0].message.content = "I need to multiply these numbers."
-        first_response.choices[0].message.tool_calls = [tool_call]
-        
-        # Second response: agent provides final answer
-        second_response = MagicMock()
-        second_response.choices[0].message.content = "The answer is 15."
-        second_response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.side_effect = [first_response, second_response]
-        
-        # Run the reasoning loop
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify termination conditions
-        assert result["total_iterations"] <= 10, \
-            f"Loop did not terminate within 10 iterations: {result['total_iterations']}"
-        assert result["final_answer"] is not None, \
-            "Final answer is missing"
-        assert result["final_answer"] != "", \
-            "Final answer is empty"
-        assert len(result["steps"]) > 0, \
-            "No reasoning steps were recorded"
-
-
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_tool_result_integration(problem):
+    # Verify termination conditions
+    assert result["total_iterations"] <= 10, \
+        f"Loop did not terminate within 10 iterations: {result['total_iterations']}"
+    assert result["final_answer"] is not None, \
+        "Final answer is missing"
+    assert result["final_answer"] != "", \
+        "Final answer is empty"
+    assert len(result["steps"]) > 0, \
+        "No reasoning steps were recorded"
+
+
+def _check_tool_integration(result, problem):
     """
     Property 7: Tool Result Integration
-    
-    *For any* reasoning solution that uses the multiplication tool, the tool result 
-    should appear in the message history after the tool call, and the final answer 
+
+    *For any* reasoning solution that uses the multiplication tool, the tool result
+    should appear in the message history after the tool call, and the final answer
     should reflect the tool's computation.
-    
+
     **Validates: Requirements 6.3**
     """
-    # Mock the OpenAI client to simulate tool usage
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock tool call object
-        tool_call = MagicMock()
-        tool_call.id = "call_1"
-        tool_call.function.name = "multiply"
-        tool_call.function.arguments = json.dumps({"a": 5, "b": 3})
-        
-        # First response: agent calls multiplication tool
-        first_response = MagicMock()
-        first_response.choices[0].message.content = "I'll multiply these numbers."
-        first_response.choices[0].message.tool_calls = [tool_call]
-        
-        # Second response: agent uses the tool result in final answer
-        second_response = MagicMock()
-        second_response.choices[0].message.content = "The result of 5 times 3 is 15."
-        second_response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.side_effect = [first_response, second_response]
-        
-        # Run the reasoning loop
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify tool was used
-        assert "multiply" in result["tools_used"], \
-            "Multiplication tool was not tracked in tools_used"
-        
-        # Verify tool result appears in steps
-        tool_steps = [step for step in result["steps"] if step["tool_called"]]
-        assert len(tool_steps) > 0, \
-            "No tool calls were recorded in reasoning steps"
-        
-        # Verify tool result is present
-        for step in tool_steps:
-            assert step["tool_result"] is not None, \
-                "Tool result is missing from step"
-            assert step["tool_result"] != "", \
-                "Tool result is empty"
-        
-        # Verify final answer reflects the computation
-        assert result["final_answer"] is not None, \
-            "Final answer is missing"
-        assert result["final_answer"] != "", \
-            "Final answer is empty"
-        # The final answer should contain or reference the tool result
-        assert "15" in result["final_answer"] or len(result["steps"]) > 0, \
-            "Final answer does not reflect tool computation"
-
-
-@settings(max_examples=10)
-@given(problem=math_problems)
-def test_tool_usage_tracking(problem):
+    # Verify tool was used
+    assert "multiply" in result["tools_used"], \
+        "Multiplication tool was not tracked in tools_used"
+
+    # Verify tool result appears in steps
+    tool_steps = list(iter_tool_steps(result["steps"]))
+    assert len(tool_steps) > 0, \
+        "No tool calls were recorded in reasoning steps"
+
+    # Verify tool result is present
+    for step in tool_steps:
+        assert step["tool_result"] is not None, \
+            "Tool result is missing from step"
+        assert step["tool_result"] != "", \
+            "Tool result is empty"
+
+    # Verify final answer reflects the computation
+    assert result["final_answer"] is not None, \
+        "Final answer is missing"
+    assert result["final_answer"] != "", \
+        "Final answer is empty"
+    # The final answer should contain or reference the tool result
+    assert "15" in result["final_answer"] or len(result["steps"]) > 0, \
+        "Final answer does not reflect tool computation"
+
+
+def _check_tool_tracking(result, problem):
     """
     Property 8: Tool Usage Tracking
-    
-    *For any* completed reasoning solution, the tools_used list should accurately 
-    reflect all tools that were invoked during the reasoning process, with each 
+
+    *For any* completed reasoning solution, the tools_used list should accurately
+    reflect all tools that were invoked during the reasoning process, with each
     tool appearing exactly once.
-    
+
     **Validates: Requirements 6.4**
     """
-    # Mock the OpenAI client to simulate tool usage
-    with patch('reasoning_agent.reasoning_agent.OpenAI') as mock_openai_class:
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create mock tool call objects
-        tool_call_1 = MagicMock()
-        tool_call_1.id = "call_1"
-        tool_call_1.function.name = "multiply"
-        tool_call_1.function.arguments = json.dumps({"a": 5, "b": 3})
-        
-        tool_call_2 = MagicMock()
-        tool_call_2.id = "call_2"
-        tool_call_2.function.name = "multiply"
-        tool_call_2.function.arguments = json.dumps({"a": 15, "b": 2})
-        
-        # First response: agent calls multiplication tool
-        first_response = MagicMock()
-        first_response.choices[0].message.content = "I'll multiply 5 and 3."
-        first_response.choices[0].message.tool_calls = [tool_call_1]
-        
-        # Second response: agent calls multiplication tool again
-        second_response = MagicMock()
-        second_response.choices[0].message.content = "Now I'll multiply the result by 2."
-        second_response.choices[0].message.tool_calls = [tool_call_2]
-        
-        # Third response: agent provides final answer
-        third_response = MagicMock()
-        third_response.choices[0].message.content = "The final answer is 30."
-        third_response.choices[0].message.tool_calls = None
-        
-        mock_client.chat.completions.create.side_effect = [
-            first_response, 
-            second_response, 
-            third_response
-        ]
-        
-        # Run the reasoning loop
-        agent = ReasoningAgent(api_key="test-key")
-        result = agent.run_reasoning_loop(problem)
-        
-        # Verify tools_used list exists
-        assert "tools_used" in result, \
-            "Result does not contain 'tools_used' field"
-        
-        # Verify tools_used is a list
-        assert isinstance(result["tools_used"], list), \
-            "tools_used is not a list"
-        
-        # Verify all invoked tools are tracked
-        # Count how many times multiply was called in steps
-        tool_calls_in_steps = sum(1 for step in result["steps"] if step["tool_called"])
-        assert tool_calls_in_steps > 0, \
-            "No tool calls were made in reasoning steps"
-        
-        # Verify multiply tool is in tools_used
-        assert "multiply" in result["tools_used"], \
-            "multiply tool was not tracked in tools_used despite being called"
-        
-        # Verify no duplicate tool entries
-        # Each tool should appear exactly once in tools_used
-        assert len(result["tools_used"]) == len(set(result["tools_used"])), \
-            f"Duplicate tool entries found in tools_used: {result['tools_used']}"
-        
-        # Verify tools_used is sorted (for consistency)
-        assert result["tools_used"] == sorted(result["tools_used"]), \
-            f"tools_used is not sorted: {result['tools_used']}"
-        
-        # Verify that all tools in tools_used were actually called
-        # by checking that they appear in at least one step
-        for tool_name in result["tools_used"]:
-            tool_was_called = any(
-                step["tool_name"] == tool_name 
-                for step in result["steps"] 
-                if step["tool_called"]
+    # Verify tools_used list exists
+    assert "tools_used" in result, \
+        "Result does not contain 'tools_used' field"
+
+    # Verify tools_used is a list
+    assert isinstance(result["tools_used"], list), \
+        "tools_used is not a list"
+
+    # Verify all invoked tools are tracked
+    # Count how many times multiply was called in steps
+    tool_calls_in_steps = sum(1 for _ in iter_tool_steps(result["steps"]))
+    assert tool_calls_in_steps > 0, \
+        "No tool calls were made in reasoning steps"
+
+    # Verify multiply tool is in tools_used
+    assert "multiply" in result["tools_used"], \
+        "multiply tool was not tracked in tools_used despite being called"
+
+    # Verify no duplicate tool entries
+    # Each tool should appear exactly once in tools_used
+    assert len(result["tools_used"]) == len(set(result["tools_used"])), \
+        f"Duplicate tool entries found in tools_used: {result['tools_used']}"
+
+    # Verify tools_used is sorted (for consistency)
+    assert result["tools_used"] == sorted(result["tools_used"]), \
+        f"tools_used is not sorted: {result['tools_used']}"
+
+    # Verify that all tools in tools_used were actually called
+    # by checking that they appear in at least one step
+    for tool_name in result["tools_used"]:
+        tool_was_called = any(
+            step["tool_name"] == tool_name
+            for step in iter_tool_steps(result["steps"])
+        )
+        assert tool_was_called, \
+            f"Tool '{tool_name}' in tools_used but was never called in steps"
+
+
+# Each scenario is (name, response sequence, property checks to apply).
+# Properties that used interchangeable response sequences share a scenario,
+# so the agent runs once per (problem, scenario) pair instead of once per
+# property: the tool-call scenario validates properties 4, 5, and 7 from a
+# single run.
+SCENARIOS = (
+    ("single_step", _SINGLE_STEP_RESPONSES, (_check_problem_acceptance,)),
+    ("three_steps", _SEQUENTIAL_RESPONSES, (_check_sequential_steps,)),
+    ("two_steps", _FINAL_ANSWER_RESPONSES, (_check_final_answer,)),
+    ("tool_call", _TOOL_RESPONSES,
+     (_check_solution_preservation, _check_termination, _check_tool_integration)),
+    ("two_tool_calls", _TWO_TOOL_RESPONSES, (_check_tool_tracking,)),
+)
+
+
+# Memoized scenario results. Keyed on (problem, id(responses)) because the
+# response namespaces themselves are unhashable; the sequences are module
+# constants, so their ids are stable for the life of the run. The mock is
+# deterministic given a response sequence, so a result can be shared by any
+# number of property checks - provided no check mutates it.
+_SCENARIO_RESULTS: dict = {}
+
+
+def _run_scenario(agent, mock_openai, problem, responses):
+    """
+    Run the reasoning loop once against a canned response sequence.
+
+    Results are memoized per (problem, responses) pair, so if several
+    tests exercise the same scenario the agent only actually runs for the
+    first one.
+
+    Args:
+        agent: The shared ReasoningAgent instance
+        mock_openai: The shared mocked OpenAI client
+        problem: The math problem string
+        responses: Tuple of response fakes to feed the mock, in order
+
+    Returns:
+        The solution dictionary from run_reasoning_loop
+    """
+    key = (problem, id(responses))
+    result = _SCENARIO_RESULTS.get(key)
+    if result is None:
+        mock_openai.reset_mock(return_value=True, side_effect=True)
+        mock_openai.chat.completions.create.side_effect = list(responses)
+        result = agent.run_reasoning_loop(problem, use_cache=False, use_fastpath=False)
+        _SCENARIO_RESULTS[key] = result
+    return result
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s[0])
+@pytest.mark.parametrize("problem", MATH_PROBLEMS)
+def test_reasoning_loop_properties(problem, scenario, mock_openai, agent):
+    """
+    Run each scenario once per problem and apply every property check that
+    the scenario's response sequence can validate.
+    """
+    _, responses, checks = scenario
+    result = _run_scenario(agent, mock_openai, problem, responses)
+    for check in checks:
+        check(result, problem)
+
+
+def test_assistant_echo_matches_wire_format():
+    """
+    The loop echoes assistant turns back to the API via model_dump instead
+    of rebuilding the dict field-by-field. Verify the dump of a real SDK
+    message produces the structure the API expects.
+    """
+    from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+    from openai.types.chat.chat_completion_message_tool_call import Function
+
+    message = ChatCompletionMessage(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            ChatCompletionMessageToolCall(
+                id="call_1",
+                type="function",
+                function=Function(name="multiply", arguments=_ARGS_5_3)
             )
-            assert tool_was_called, \
-                f"Tool '{tool_name}' in tools_used but was never called in steps"
+        ]
+    )
+    dumped = message.model_dump(exclude_none=True, exclude={"function_call"})
+
+    assert dumped["role"] == "assistant"
+    assert dumped["tool_calls"] == [{
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "multiply", "arguments": _ARGS_5_3}
+    }]
+
+
+def test_warmup_semantic_cache_batches_embeddings(tmp_path, mock_openai):
+    """
+    Warmup should embed problems in batches (one embeddings call for a
+    small list), index only problems with a cached solution, and the index
+    should survive a save/load round trip.
+    """
+    mock_openai.reset_mock(return_value=True, side_effect=True)
+
+    # Pure data the code only reads - no call tracking needed
+    item = SimpleNamespace(embedding=[1.0, 0.0, 0.0])
+    mock_openai.embeddings.create.return_value = SimpleNamespace(data=[item, item])
+
+    agent = ReasoningAgent(api_key="test-key", semantic_cache_threshold=0.95)
+    agent.clear_cache()
+    solution = {"problem": "What is 5 times 3?", "final_answer": "15"}
+    agent._cache_store(agent._cache_key("What is 5 times 3?"), solution)
+
+    added = agent.warmup_semantic_cache(["What is 5 times 3?", "never solved"])
+
+    # One batched call, one indexed entry (the unsolved problem is skipped)
+    assert mock_openai.embeddings.create.call_count == 1
+    assert added == 1
+    assert len(agent._sem_index) == 1
+
+    # Round-trip the index through disk
+    index_path = str(tmp_path / "sem_index.npz")
+    agent.save_semantic_index(index_path)
+    agent._sem_index.clear()
+    loaded = agent.load_semantic_index(index_path)
+
+    assert loaded == 1
+    assert agent._sem_index[0][1]["final_answer"] == "15"
+    agent.clear_cache()
+
+
+def _stream_chunk(content=None, tool_calls=None):
+    """
+    Build a lightweight streaming chunk (one SSE delta).
+
+    The streaming loop reads .choices[0].delta.content and
+    .delta.tool_calls, so a SimpleNamespace tree is enough here too.
+
+    Args:
+        content: Text delta, or None
+        tool_calls: Optional list of tool-call fragment namespaces
+
+    Returns:
+        A chunk namespace shaped like a ChatCompletionChunk
+    """
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            delta=SimpleNamespace(content=content, tool_calls=tool_calls)
+        )]
+    )
+
+
+def _tool_fragment(index, call_id=None, name=None, arguments=None):
+    """
+    Build a streamed tool-call fragment.
+
+    Fragments carry an index so arguments split across deltas can be
+    merged back into one call - exactly what the loop's accumulator does.
+
+    Args:
+        index: Tool-call slot the fragment belongs to
+        call_id: Call id (only present on the first fragment)
+        name: Function name (only present on the first fragment)
+        arguments: Partial JSON argument text
+
+    Returns:
+        A fragment namespace shaped like a streamed tool-call delta
+    """
+    return SimpleNamespace(
+        index=index,
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+def test_stream_reasoning_loop_matches_blocking_loop(mock_openai, agent):
+    """
+    Feed the streaming loop canned chunk sequences - text deltas plus a
+    tool call whose arguments arrive split across fragments - and verify
+    the token events reproduce the deltas, the steps are complete, and
+    the final solution event is identical to what the blocking loop
+    produces from the equivalent non-streaming responses.
+    """
+    problem = "What is 5 times 3?"
+
+    # Iteration 1: reasoning text in two deltas, then a tool call whose
+    # id/name arrive first and whose JSON arguments stream in two parts
+    first_stream = [
+        _stream_chunk(content="I need to "),
+        _stream_chunk(content="multiply 5 and 3."),
+        _stream_chunk(tool_calls=[
+            _tool_fragment(0, call_id="call_1", name="multiply", arguments='{"a": 5')
+        ]),
+        _stream_chunk(tool_calls=[_tool_fragment(0, arguments=', "b": 3}')]),
+    ]
+    # Iteration 2: the final answer as two text deltas, no tool calls
+    second_stream = [
+        _stream_chunk(content="The result is "),
+        _stream_chunk(content="15."),
+    ]
+
+    mock_openai.reset_mock(return_value=True, side_effect=True)
+    mock_openai.chat.completions.create.side_effect = [first_stream, second_stream]
+
+    events = list(agent.stream_reasoning_loop(
+        problem, use_cache=False, use_fastpath=False
+    ))
+
+    # Every streamed call must open through the guarded wrapper
+    for call in mock_openai.chat.completions.create.call_args_list:
+        assert call.kwargs["stream"] is True
+
+    tokens = [e["text"] for e in events if e["type"] == "token"]
+    assert tokens == ["I need to ", "multiply 5 and 3.", "The result is ", "15."]
+
+    steps = [e["step"] for e in events if e["type"] == "step_complete"]
+    assert len(steps) == 2
+    assert steps[0]["tool_called"] is True
+    assert steps[0]["tool_name"] == "multiply"
+    assert steps[0]["tool_input"] == {"a": 5, "b": 3}  # merged across fragments
+    assert steps[0]["tool_result"] == "15"
+    assert steps[1]["is_final"] is True
+
+    solutions = [e["solution"] for e in events if e["type"] == "solution"]
+    assert len(solutions) == 1
+
+    # The blocking loop, fed the same turns as whole responses, must
+    # produce the identical structured solution
+    agent._reset()
+    mock_openai.reset_mock(return_value=True, side_effect=True)
+    mock_openai.chat.completions.create.side_effect = [
+        _resp("I need to multiply 5 and 3.", (_CALL_5_3,)),
+        _resp("The result is 15."),
+    ]
+    blocking = agent.run_reasoning_loop(
+        problem, use_cache=False, use_fastpath=False
+    )
+    assert solutions[0] == blocking
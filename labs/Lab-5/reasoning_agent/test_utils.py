@@ -5,7 +5,7 @@ Tests formatting functions, tool call parsing, and system prompt initialization.
 """
 
 import json
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 from reasoning_agent.utils import (
     format_reasoning_step,
     parse_tool_calls,
@@ -66,44 +66,29 @@ class TestParseToolCalls:
     
     def test_parse_tool_calls_with_object_response(self):
         """Test parsing tool calls from object-based response."""
-        # Create mock tool call object
-        tool_call = MagicMock()
-        tool_call.id = "call_123"
-        tool_call.function.name = "multiply"
-        tool_call.function.arguments = json.dumps({"a": 5, "b": 3})
-        
-        # Create mock response
-        response = MagicMock()
-        response.get = MagicMock(side_effect=lambda key, default=None: 
-            [MagicMock(tool_calls=[tool_call])] if key == "choices" else default)
-        
-        message = MagicMock()
-        message.tool_calls = [tool_call]
-        
-        # Manually construct response for testing
-        response_dict = {
+        # SDK-style message: attribute access instead of dict indexing.
+        # Plain namespaces are enough - no mock machinery needed.
+        tool_call = SimpleNamespace(
+            id="call_123",
+            function=SimpleNamespace(
+                name="multiply",
+                arguments=json.dumps({"a": 5, "b": 3})
+            )
+        )
+        response = {
             "choices": [
                 {
-                    "message": message
+                    "message": SimpleNamespace(tool_calls=[tool_call])
                 }
             ]
         }
         
-        # Since we're using object attributes, test directly
-        tool_calls = []
-        if hasattr(message, "tool_calls") and message.tool_calls:
-            for tc in message.tool_calls:
-                parsed_call = {
-                    "id": tc.id,
-                    "name": tc.function.name,
-                    "arguments": json.loads(tc.function.arguments)
-                }
-                tool_calls.append(parsed_call)
+        tool_calls = parse_tool_calls(response)
         
         assert len(tool_calls) == 1
-        assert tool_calls[0]["id"] == "call_123"
-        assert tool_calls[0]["name"] == "multiply"
-        assert tool_calls[0]["arguments"] == {"a": 5, "b": 3}
+        assert tool_calls[0].id == "call_123"
+        assert tool_calls[0].name == "multiply"
+        assert tool_calls[0].arguments == {"a": 5, "b": 3}
     
     def test_parse_tool_calls_with_dict_response(self):
         """Test parsing tool calls from dictionary-based response."""
@@ -128,9 +113,9 @@ class TestParseToolCalls:
         tool_calls = parse_tool_calls(response)
         
         assert len(tool_calls) == 1
-        assert tool_calls[0]["id"] == "call_456"
-        assert tool_calls[0]["name"] == "multiply"
-        assert tool_calls[0]["arguments"] == {"a": 10, "b": 2}
+        assert tool_calls[0].id == "call_456"
+        assert tool_calls[0].name == "multiply"
+        assert tool_calls[0].arguments == {"a": 10, "b": 2}
     
     def test_parse_tool_calls_with_no_tool_calls(self):
         """Test parsing when response has no tool calls."""
@@ -178,7 +163,7 @@ class TestParseToolCalls:
         
         tool_calls = parse_tool_calls(response)
         
-        # Should handle gracefully and return empty list
+        # Should handle gracefully and return an empty result
         assert len(tool_calls) == 0
     
     def test_parse_multiple_tool_calls(self):
@@ -211,8 +196,8 @@ class TestParseToolCalls:
         tool_calls = parse_tool_calls(response)
         
         assert len(tool_calls) == 2
-        assert tool_calls[0]["id"] == "call_1"
-        assert tool_calls[1]["id"] == "call_2"
+        assert tool_calls[0].id == "call_1"
+        assert tool_calls[1].id == "call_2"
 
 
 class TestFormatFinalAnswer:
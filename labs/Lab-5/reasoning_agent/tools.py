@@ -17,6 +17,51 @@ This separation allows the model to reason about what needs to be done
 without directly executing code.
 """
 
+import functools
+import json
+
+import numpy as np
+
+# orjson serializes batch results faster than the stdlib encoder; fall
+# back to json where it isn't installed.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:  # pragma: no cover - exercised only without orjson
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+# msgspec validates and coerces tool arguments in a single C-level pass,
+# replacing ad-hoc field checks. Optional: without it, argument
+# validation falls back to Python's own keyword unpacking below.
+try:
+    import msgspec
+
+    class _MultiplyArgs(msgspec.Struct):
+        a: float
+        b: float
+
+    # Tool name -> argument schema. Tools without a schema skip typed
+    # validation and rely on keyword unpacking.
+    _TOOL_SCHEMAS = {"multiply": _MultiplyArgs}
+except ImportError:  # pragma: no cover - exercised only without msgspec
+    msgspec = None
+    _TOOL_SCHEMAS = {}
+
+# numba compiles the element-wise multiply into a native SIMD ufunc,
+# removing Python call overhead from the batched path. Optional: NumPy's
+# own np.multiply ufunc is the drop-in fallback with identical semantics.
+try:
+    from numba import vectorize as _nb_vectorize
+
+    @_nb_vectorize(["float64(float64, float64)"], cache=True)
+    def _multiply_ufunc(a, b):
+        return a * b
+except ImportError:  # pragma: no cover - exercised only without numba
+    _multiply_ufunc = np.multiply
+
 
 def multiply(a: float, b: float) -> float:
     """
@@ -38,88 +83,244 @@ def multiply(a: float, b: float) -> float:
     return a * b
 
 
+def multiply_batch(a, b) -> np.ndarray:
+    """
+    Multiply two sequences of numbers element-wise.
+
+    Dispatching hundreds of scalar multiplications through Python-level
+    tool calls pays interpreter overhead on every pair. The ufunc
+    amortizes that across the whole batch in one vectorized operation
+    (numba-compiled with SIMD when numba is installed, plain np.multiply
+    otherwise).
+
+    Args:
+        a: Sequence of first factors
+        b: Sequence of second factors
+
+    Returns:
+        Array of element-wise products
+    """
+    return _multiply_ufunc(np.asarray(a, dtype=np.float64),
+                           np.asarray(b, dtype=np.float64))
+
+
+# Tool definitions in OpenAI function calling format, built once at import.
+# The schema is fully static, so rebuilding the nested dict/list structure
+# on every call (once per model turn in the reasoning loop) is pure
+# allocation churn. Callers treat this as read-only.
+_TOOL_DEFINITIONS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "multiply",  # Must match the name in execute_tool()
+            "description": "Multiply two numbers together",  # Helps model decide when to use
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "number",
+                        "description": "First number to multiply"
+                    },
+                    "b": {
+                        "type": "number",
+                        "description": "Second number to multiply"
+                    }
+                },
+                "required": ["a", "b"]  # Both parameters are required
+            }
+        }
+    }
+]
+
+
+# Pre-encoded JSON for the static schema, frozen once at import. The
+# OpenAI SDK only accepts Python objects for the tools parameter (it
+# re-encodes internally, keyed on object identity for any client-side
+# caching - hence the shared _TOOL_DEFINITIONS list above), but callers
+# that talk to the HTTP API directly, log payloads, or hash the schema
+# can splice these bytes in without re-serializing every turn.
+_TOOL_DEFINITIONS_JSON = _dumps(_TOOL_DEFINITIONS).encode("utf-8")
+
+
+def get_tool_definitions_json() -> bytes:
+    """
+    Get the tool definitions pre-serialized as UTF-8 JSON bytes.
+
+    Encoded once at import; every call returns the same bytes object.
+
+    Returns:
+        JSON encoding of get_tool_definitions() as bytes
+    """
+    return _TOOL_DEFINITIONS_JSON
+
+
 def get_tool_definitions() -> list:
     """
     Get tool definitions in OpenAI function calling format.
-    
+
     These definitions tell the OpenAI model:
     - What tools are available
     - What each tool does
     - What parameters each tool accepts
-    
+
     The model uses this information to decide when and how to call tools.
-    
+
     Format: OpenAI Function Calling specification
     - type: "function" (required)
     - function.name: Tool name (must match execute_tool routing)
     - function.description: What the tool does (helps model decide when to use it)
     - function.parameters: JSON schema describing input parameters
-    
+
     Returns:
-        List of tool definitions compatible with OpenAI API
-    """
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "multiply",  # Must match the name in execute_tool()
-                "description": "Multiply two numbers together",  # Helps model decide when to use
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "a": {
-                            "type": "number",
-                            "description": "First number to multiply"
-                        },
-                        "b": {
-                            "type": "number",
-                            "description": "Second number to multiply"
-                        }
-                    },
-                    "required": ["a", "b"]  # Both parameters are required
-                }
-            }
-        }
-    ]
+        List of tool definitions compatible with OpenAI API. The same list
+        object is returned every call - do not mutate it.
+    """
+    return _TOOL_DEFINITIONS
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _multiply_str(a, b) -> str:
+    """
+    Multiply two numbers and format the product as a string, memoized.
+
+    A tutoring session re-multiplies the same small numbers constantly;
+    caching the formatted string skips both the arithmetic and the
+    number->str conversion on repeats. typed=True keeps int and float
+    inputs distinct so 5*3 still renders "15", not "15.0". Bounded at
+    1024 entries (~200B each) so memory stays capped under LRU eviction.
+
+    Zero operands must not reach this cache: 0.0 and -0.0 compare (and
+    hash) equal, so they would share one entry even though the product's
+    formatted sign differs ("0.0" vs "-0.0"). execute_tool routes those
+    around the cache.
+
+    Args:
+        a: First factor
+        b: Second factor
+
+    Returns:
+        The product formatted with str()
+    """
+    return str(multiply(a, b))
+
+
+# Route table mapping tool name -> implementation. A dict lookup stays O(1)
+# no matter how many tools exist, where an if/elif chain grows linearly and
+# re-compares strings on every call.
+_TOOL_REGISTRY = {
+    "multiply": multiply,
+}
+
+
+def register_tool(name: str, fn) -> None:
+    """
+    Register a new tool implementation.
+
+    Lets extensions add tools without touching the dispatch code - just
+    add the matching entry to the tool definitions so the model can see it.
+
+    Args:
+        name: Tool name (must match the name in the tool definitions)
+        fn: Callable invoked with the tool input as keyword arguments
+    """
+    _TOOL_REGISTRY[name] = fn
+
+
+def _execute_tool_raw(tool_name: str, tool_input: dict):
+    """
+    Execute a tool by name and return its native result.
+
+    Internal callers that consume tool results in code (batching, tests,
+    chained computations) don't need the LLM-facing string form; going
+    through str() and back to float costs two conversions per call and
+    can lose precision through decimal-string rounding. This variant
+    returns whatever the implementation returns.
+
+    Args:
+        tool_name: Name of the tool to execute
+        tool_input: Dictionary of input parameters
+
+    Returns:
+        The tool's native return value (float for multiply, ndarray for
+        batched inputs)
+
+    Raises:
+        ValueError: If tool_name is not recognized
+        msgspec.ValidationError: If the tool has a registered schema and
+            the input fails typed validation (only when msgspec is
+            installed)
+        TypeError: If required parameters are missing (raised by Python's
+            own call machinery via keyword unpacking)
+    """
+    fn = _TOOL_REGISTRY.get(tool_name)
+    if fn is None:
+        # Unknown tool - this shouldn't happen if tool definitions are correct
+        raise ValueError(f"Unknown tool: {tool_name}")
+
+    # Batched fast path: list inputs are multiplied element-wise in one
+    # vectorized call instead of N scalar dispatches.
+    if tool_name == "multiply" and isinstance(tool_input.get("a"), list):
+        return multiply_batch(tool_input["a"], tool_input["b"])
+
+    # Typed validation: msgspec checks and coerces all fields in one
+    # C-level pass, raising ValidationError with the offending field.
+    if msgspec is not None:
+        schema = _TOOL_SCHEMAS.get(tool_name)
+        if schema is not None:
+            args = msgspec.convert(tool_input, schema)
+            return fn(**msgspec.structs.asdict(args))
+
+    # Keyword unpacking delegates argument validation to the interpreter:
+    # a missing parameter raises TypeError with the exact parameter name.
+    return fn(**tool_input)
 
 
 def execute_tool(tool_name: str, tool_input: dict) -> str:
     """
     Execute a tool by name with the given input.
-    
+
     This is the router that connects tool calls from the model to actual
     implementations. When the model requests a tool call, this function:
     1. Receives the tool name and parameters
-    2. Routes to the correct implementation
+    2. Looks the implementation up in the registry
     3. Executes the tool
     4. Returns the result as a string
-    
-    The result is then fed back to the model for further reasoning.
-    
+
+    The result is then fed back to the model for further reasoning. This
+    is the LLM boundary: stringification happens only here, while
+    internal callers use _execute_tool_raw to skip it.
+
     Args:
         tool_name: Name of the tool to execute (from model's tool call)
         tool_input: Dictionary of input parameters (from model's tool call)
-    
+
     Returns:
         String representation of the tool result
-    
+
     Raises:
         ValueError: If tool_name is not recognized
+        msgspec.ValidationError: If the tool has a registered schema and
+            the input fails typed validation (only when msgspec is
+            installed)
+        TypeError: If required parameters are missing (raised by Python's
+            own call machinery via keyword unpacking)
     """
-    if tool_name == "multiply":
-        # Extract parameters from the tool input
-        a = tool_input.get("a")
-        b = tool_input.get("b")
-        
-        # Validate that required parameters are present
-        if a is None or b is None:
-            raise ValueError("multiply requires 'a' and 'b' parameters")
-        
-        # Execute the tool
-        result = multiply(a, b)
-        
-        # Return result as string (model will see this as text)
-        return str(result)
-    else:
-        # Unknown tool - this shouldn't happen if tool definitions are correct
-        raise ValueError(f"Unknown tool: {tool_name}")
+    # Batched results serialize to a JSON array rather than repr of a list
+    if tool_name == "multiply" and isinstance(tool_input.get("a"), list):
+        return _dumps(multiply_batch(tool_input["a"], tool_input["b"]).tolist())
+
+    # Hot path: repeated products come straight out of the string cache.
+    # Missing parameters fall through to the generic path so they still
+    # raise TypeError from keyword unpacking.
+    if (_TOOL_REGISTRY.get(tool_name) is multiply
+            and "a" in tool_input and "b" in tool_input):
+        a = tool_input["a"]
+        b = tool_input["b"]
+        # Signed zero breaks the cache key: 0.0 == -0.0, so a*-5.0 for
+        # a=0.0 and a=-0.0 would share one entry despite formatting as
+        # "-0.0" vs "0.0". Zero operands are computed directly instead.
+        if a == 0 or b == 0:
+            return str(multiply(a, b))
+        return _multiply_str(a, b)
+
+    return str(_execute_tool_raw(tool_name, tool_input))
@@ -0,0 +1,52 @@
+"""
+Shared lightweight types for the Reasoning Math Agent.
+
+Chat messages accumulate in session state for the lifetime of a
+conversation, so their per-instance footprint matters. A slotted, frozen
+dataclass stores just the two field references (~48 bytes) where a dict
+carries a full hash table (~232 bytes), and attribute access on slots is
+faster than dict lookup.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict
+
+# Canonical interned role strings. Every message stores one of these three
+# values; roles arriving from JSON or other runtime construction are fresh
+# string objects each time, so mapping them through this table collapses
+# them to a single shared instance. Lookup also fails loud (KeyError) on
+# an invalid role instead of storing it silently.
+_ROLES = {r: sys.intern(r) for r in ("user", "assistant", "system")}
+
+
+@dataclass(slots=True, frozen=True)
+class Message:
+    """
+    A single chat message.
+
+    Immutable by design: history entries are never edited in place, and
+    frozen instances are hashable, which lets rendered history be memoized
+    on message tuples.
+
+    Attributes:
+        role: Who produced the message ("user", "assistant", or "system")
+        content: The message text
+    """
+
+    role: str
+    content: str
+
+    def __post_init__(self):
+        # Canonicalize to the interned instance. frozen=True blocks normal
+        # assignment, so go through object.__setattr__ as dataclasses do.
+        object.__setattr__(self, "role", _ROLES[self.role])
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Convert to the plain dict shape the OpenAI API expects.
+
+        Returns:
+            Dictionary with "role" and "content" keys
+        """
+        return {"role": self.role, "content": self.content}
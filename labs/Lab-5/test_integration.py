@@ -8,10 +8,59 @@ Requirements: 1.1, 1.2, 1.3, 1.4, 5.1, 5.2, 5.3, 5.4
 """
 
 import pytest
+from dataclasses import dataclass
+from typing import Optional, Tuple
 from unittest.mock import MagicMock, patch
 import json
 from reasoning_agent.reasoning_agent import ReasoningAgent
 from reasoning_agent.tools import execute_tool
+from reasoning_agent.utils import iter_tool_steps
+
+
+# Lightweight response fakes. MagicMock lazily allocates a child mock with
+# reflection machinery on every attribute access, which is ~100x the cost
+# of a plain attribute load; these frozen dataclasses give the reasoning
+# loop real .choices[0].message.tool_calls attributes at plain-object
+# cost. slots=True drops each instance's __dict__, so fixtures held
+# alive for the whole suite run keep peak RSS down.
+@dataclass(frozen=True, slots=True)
+class _FakeFunction:
+    name: str
+    arguments: str
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeToolCall:
+    id: str
+    function: _FakeFunction
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeMessage:
+    content: str
+    tool_calls: Optional[Tuple[_FakeToolCall, ...]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeChoice:
+    message: _FakeMessage
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeResponse:
+    choices: Tuple[_FakeChoice, ...]
+
+
+# Argument JSON fixtures, written once at module load instead of
+# re-serializing the same dicts inside every test body
+_ARGS_5_3 = json.dumps({"a": 5, "b": 3})
+_ARGS_15_2 = json.dumps({"a": 15, "b": 2})
+_ARGS_15_23 = json.dumps({"a": 15, "b": 23})
+
+
+def _fake_response(content, tool_calls=None):
+    """Build a minimal chat-completion response fake."""
+    return _FakeResponse((_FakeChoice(_FakeMessage(content, tool_calls)),))
 
 
 class TestCompleteReasoningFlow:
@@ -31,28 +80,25 @@ class TestCompleteReasoningFlow:
             mock_client = MagicMock()
             mock_openai_class.return_value = mock_client
             
-            # Create mock tool call
-            tool_call = MagicMock()
-            tool_call.id = "call_1"
-            tool_call.function.name = "multiply"
-            tool_call.function.arguments = json.dumps({"a": 15, "b": 23})
+            # Create fake tool call
+            tool_call = _FakeToolCall(
+                "call_1", _FakeFunction("multiply", _ARGS_15_23)
+            )
             
             # Step 1: Agent analyzes and calls tool
-            step1_response = MagicMock()
-            step1_response.choices[0].message.content = "I need to multiply 15 by 23."
-            step1_response.choices[0].message.tool_calls = [tool_call]
+            step1_response = _fake_response(
+                "I need to multiply 15 by 23.", (tool_call,)
+            )
             
             # Step 2: Agent provides final answer
-            step2_response = MagicMock()
-            step2_response.choices[0].message.content = "The result of 15 times 23 is 345."
-            step2_response.choices[0].message.tool_calls = None
+            step2_response = _fake_response("The result of 15 times 23 is 345.")
             
             mock_client.chat.completions.create.side_effect = [step1_response, step2_response]
             
             # Execute the complete flow
             agent = ReasoningAgent(api_key="test-key")
             problem = "What is 15 times 23?"
-            result = agent.run_reasoning_loop(problem)
+            result = agent.run_reasoning_loop(problem, use_cache=False, use_fastpath=False)
             
             # Verify complete flow
             assert result["problem"] == problem
@@ -67,7 +113,7 @@ class TestCompleteReasoningFlow:
             assert result["steps"][1]["step_number"] == 2
             
             # Verify tool was used
-            tool_steps = [s for s in result["steps"] if s["tool_called"]]
+            tool_steps = list(iter_tool_steps(result["steps"]))
             assert len(tool_steps) > 0
             assert tool_steps[0]["tool_name"] == "multiply"
             assert tool_steps[0]["tool_result"] == "345"
@@ -83,16 +129,14 @@ class TestCompleteReasoningFlow:
             mock_openai_class.return_value = mock_client
             
             # Single response with reasoning and answer
-            response = MagicMock()
-            response.choices[0].message.content = "The answer is 8."
-            response.choices[0].message.tool_calls = None
+            response = _fake_response("The answer is 8.")
             
             mock_client.chat.completions.create.return_value = response
             
             # Execute the flow
             agent = ReasoningAgent(api_key="test-key")
             problem = "What is 2 plus 6?"
-            result = agent.run_reasoning_loop(problem)
+            result = agent.run_reasoning_loop(problem, use_cache=False, use_fastpath=False)
             
             # Verify flow completed
             assert result["problem"] == problem
@@ -110,31 +154,26 @@ class TestCompleteReasoningFlow:
             mock_client = MagicMock()
             mock_openai_class.return_value = mock_client
             
-            # Create tool calls
-            tool_call_1 = MagicMock()
-            tool_call_1.id = "call_1"
-            tool_call_1.function.name = "multiply"
-            tool_call_1.function.arguments = json.dumps({"a": 5, "b": 3})
-            
-            tool_call_2 = MagicMock()
-            tool_call_2.id = "call_2"
-            tool_call_2.function.name = "multiply"
-            tool_call_2.function.arguments = json.dumps({"a": 15, "b": 2})
+            # Create fake tool calls
+            tool_call_1 = _FakeToolCall(
+                "call_1", _FakeFunction("multiply", _ARGS_5_3)
+            )
+            tool_call_2 = _FakeToolCall(
+                "call_2", _FakeFunction("multiply", _ARGS_15_2)
+            )
             
             # Step 1: First calculation
-            step1_response = MagicMock()
-            step1_response.choices[0].message.content = "First, I'll multiply 5 by 3."
-            step1_response.choices[0].message.tool_calls = [tool_call_1]
+            step1_response = _fake_response(
+                "First, I'll multiply 5 by 3.", (tool_call_1,)
+            )
             
             # Step 2: Second calculation
-            step2_response = MagicMock()
-            step2_response.choices[0].message.content = "Now I'll multiply the result by 2."
-            step2_response.choices[0].message.tool_calls = [tool_call_2]
+            step2_response = _fake_response(
+                "Now I'll multiply the result by 2.", (tool_call_2,)
+            )
             
             # Step 3: Final answer
-            step3_response = MagicMock()
-            step3_response.choices[0].message.content = "The final answer is 30."
-            step3_response.choices[0].message.tool_calls = None
+            step3_response = _fake_response("The final answer is 30.")
             
             mock_client.chat.completions.create.side_effect = [
                 step1_response, step2_response, step3_response
@@ -143,7 +182,7 @@ class TestCompleteReasoningFlow:
             # Execute the flow
             agent = ReasoningAgent(api_key="test-key")
             problem = "What is 5 times 3 times 2?"
-            result = agent.run_reasoning_loop(problem)
+            result = agent.run_reasoning_loop(problem, use_cache=False, use_fastpath=False)
             
             # Verify multi-step flow
             assert len(result["steps"]) >= 3
@@ -153,7 +192,7 @@ class TestCompleteReasoningFlow:
             assert "multiply" in result["tools_used"]
             
             # Verify tool results are preserved
-            tool_steps = [s for s in result["steps"] if s["tool_called"]]
+            tool_steps = list(iter_tool_steps(result["steps"]))
             assert len(tool_steps) >= 2
 
 
@@ -172,20 +211,10 @@ class TestMultipleProblemSequence:
             mock_client = MagicMock()
             mock_openai_class.return_value = mock_client
             
-            # Problem 1 responses
-            problem1_response = MagicMock()
-            problem1_response.choices[0].message.content = "The answer to problem 1 is 50."
-            problem1_response.choices[0].message.tool_calls = None
-            
-            # Problem 2 responses
-            problem2_response = MagicMock()
-            problem2_response.choices[0].message.content = "The answer to problem 2 is 100."
-            problem2_response.choices[0].message.tool_calls = None
-            
-            # Problem 3 responses
-            problem3_response = MagicMock()
-            problem3_response.choices[0].message.content = "The answer to problem 3 is 75."
-            problem3_response.choices[0].message.tool_calls = None
+            # One response per problem
+            problem1_response = _fake_response("The answer to problem 1 is 50.")
+            problem2_response = _fake_response("The answer to problem 2 is 100.")
+            problem3_response = _fake_response("The answer to problem 3 is 75.")
             
             mock_client.chat.completions.create.side_effect = [
                 problem1_response, problem2_response, problem3_response
@@ -195,13 +224,13 @@ class TestMultipleProblemSequence:
             agent = ReasoningAgent(api_key="test-key")
             
             problem1 = "What is 10 times 5?"
-            result1 = agent.run_reasoning_loop(problem1)
+            result1 = agent.run_reasoning_loop(problem1, use_cache=False, use_fastpath=False)
             
             problem2 = "What is 20 times 5?"
-            result2 = agent.run_reasoning_loop(problem2)
+            result2 = agent.run_reasoning_loop(problem2, use_cache=False, use_fastpath=False)
             
             problem3 = "What is 15 times 5?"
-            result3 = agent.run_reasoning_loop(problem3)
+            result3 = agent.run_reasoning_loop(problem3, use_cache=False, use_fastpath=False)
             
             # Verify each problem was processed independently
             assert result1["problem"] == problem1
@@ -319,20 +348,15 @@ class TestUIInteractionFlow:
             mock_client = MagicMock()
             mock_openai_class.return_value = mock_client
             
-            # Create mock responses
-            step1_response = MagicMock()
-            step1_response.choices[0].message.content = "Step 1: Analyzing the problem"
-            step1_response.choices[0].message.tool_calls = None
-            
-            step2_response = MagicMock()
-            step2_response.choices[0].message.content = "Step 2: Computing the result"
-            step2_response.choices[0].message.tool_calls = None
+            # Create fake responses
+            step1_response = _fake_response("Step 1: Analyzing the problem")
+            step2_response = _fake_response("Step 2: Computing the result")
             
             mock_client.chat.completions.create.side_effect = [step1_response, step2_response]
             
             # Process problem
             agent = ReasoningAgent(api_key="test-key")
-            result = agent.run_reasoning_loop("What is 5 times 3?")
+            result = agent.run_reasoning_loop("What is 5 times 3?", use_cache=False, use_fastpath=False)
             
             # Verify steps can be displayed
             messages = []
@@ -362,15 +386,13 @@ class TestUIInteractionFlow:
             mock_client = MagicMock()
             mock_openai_class.return_value = mock_client
             
-            response = MagicMock()
-            response.choices[0].message.content = "The answer is 15."
-            response.choices[0].message.tool_calls = None
+            response = _fake_response("The answer is 15.")
             
             mock_client.chat.completions.create.return_value = response
             
             # Process problem
             agent = ReasoningAgent(api_key="test-key")
-            result = agent.run_reasoning_loop("What is 5 times 3?")
+            result = agent.run_reasoning_loop("What is 5 times 3?", use_cache=False, use_fastpath=False)
             
             # Simulate chat display
             messages = []
@@ -499,22 +521,19 @@ class TestErrorHandlingAndEdgeCases:
             mock_openai_class.return_value = mock_client
             
             # Create tool call that would cause loop to continue
-            tool_call = MagicMock()
-            tool_call.id = "call_1"
-            tool_call.function.name = "multiply"
-            tool_call.function.arguments = json.dumps({"a": 5, "b": 3})
+            tool_call = _FakeToolCall(
+                "call_1", _FakeFunction("multiply", _ARGS_5_3)
+            )
             
             # Create response that always has tool calls (would loop forever)
-            response = MagicMock()
-            response.choices[0].message.content = "Continuing..."
-            response.choices[0].message.tool_calls = [tool_call]
+            response = _fake_response("Continuing...", (tool_call,))
             
             # Make it return the same response every time
             mock_client.chat.completions.create.return_value = response
             
             # Execute reasoning loop
             agent = ReasoningAgent(api_key="test-key")
-            result = agent.run_reasoning_loop("What is 5 times 3?")
+            result = agent.run_reasoning_loop("What is 5 times 3?", use_cache=False, use_fastpath=False)
             
             # Verify loop terminated within max iterations
             assert result["total_iterations"] <= 10
@@ -545,31 +564,22 @@ class TestToolIntegration:
             mock_client = MagicMock()
             mock_openai_class.return_value = mock_client
             
-            # Create multiple tool calls
-            tool_call_1 = MagicMock()
-            tool_call_1.id = "call_1"
-            tool_call_1.function.name = "multiply"
-            tool_call_1.function.arguments = json.dumps({"a": 5, "b": 3})
-            
-            tool_call_2 = MagicMock()
-            tool_call_2.id = "call_2"
-            tool_call_2.function.name = "multiply"
-            tool_call_2.function.arguments = json.dumps({"a": 15, "b": 2})
+            # Create multiple fake tool calls
+            tool_call_1 = _FakeToolCall(
+                "call_1", _FakeFunction("multiply", _ARGS_5_3)
+            )
+            tool_call_2 = _FakeToolCall(
+                "call_2", _FakeFunction("multiply", _ARGS_15_2)
+            )
             
             # Step 1: First tool call
-            step1_response = MagicMock()
-            step1_response.choices[0].message.content = "First calculation"
-            step1_response.choices[0].message.tool_calls = [tool_call_1]
+            step1_response = _fake_response("First calculation", (tool_call_1,))
             
             # Step 2: Second tool call
-            step2_response = MagicMock()
-            step2_response.choices[0].message.content = "Second calculation"
-            step2_response.choices[0].message.tool_calls = [tool_call_2]
+            step2_response = _fake_response("Second calculation", (tool_call_2,))
             
             # Step 3: Final answer
-            step3_response = MagicMock()
-            step3_response.choices[0].message.content = "Final answer is 30"
-            step3_response.choices[0].message.tool_calls = None
+            step3_response = _fake_response("Final answer is 30")
             
             mock_client.chat.completions.create.side_effect = [
                 step1_response, step2_response, step3_response
@@ -577,13 +587,13 @@ class TestToolIntegration:
             
             # Execute flow
             agent = ReasoningAgent(api_key="test-key")
-            result = agent.run_reasoning_loop("What is 5 times 3 times 2?")
+            result = agent.run_reasoning_loop("What is 5 times 3 times 2?", use_cache=False, use_fastpath=False)
             
             # Verify both tools were tracked
             assert "multiply" in result["tools_used"]
             
             # Verify tool results are in steps
-            tool_steps = [s for s in result["steps"] if s["tool_called"]]
+            tool_steps = list(iter_tool_steps(result["steps"]))
             assert len(tool_steps) >= 2
             assert tool_steps[0]["tool_result"] == "15"
             assert tool_steps[1]["tool_result"] == "30"
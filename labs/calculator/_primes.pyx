@@ -0,0 +1,38 @@
+# cython: language_level=3
+"""
+Cython sieve kernel for the calculator app.
+
+Build in place with:
+
+    python setup.py build_ext --inplace
+
+Once the extension exists next to app.py, the app prefers it over the
+NumPy/numba kernels. Typed C ints plus disabled bounds/wraparound
+checking let the striding inner loop compile to plain pointer stores
+with no Python object boxing or interpreter dispatch.
+"""
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def get_primes(int n):
+    """Return the list of primes strictly below n (Sieve of Eratosthenes)."""
+    if n < 3:
+        return []
+
+    # flags[k] != 0 <=> k is composite; direct char* stores in the loops
+    cdef bytearray buf = bytearray(n)
+    cdef char *flags = buf
+    cdef int i, j, p
+
+    flags[0] = 1
+    flags[1] = 1
+    i = 2
+    while i * i < n:
+        if not flags[i]:
+            for j in range(i * i, n, i):
+                flags[j] = 1
+        i += 1
+
+    return [p for p in range(2, n) if not flags[p]]
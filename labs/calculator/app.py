@@ -1,26 +1,351 @@
-from flask import Flask, render_template, request, jsonify
-import math
+import gzip
+import mmap
+import multiprocessing
+import os
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
+import numpy as np
+
+# orjson's C encoder has a fast path for lists of ints, where stdlib
+# json (and therefore jsonify) loops over each element at Python level.
+# Optional: fastjson() falls back to jsonify when orjson is absent.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
-def get_primes(n):
+def _sieve_odds(n):
     """
-    Returns a list of prime numbers up to n using an optimized algorithm.
+    Odds-only sieve kernel: flags[k] <=> 2k+1 is prime, for k in [1, n//2).
+
+    Crossing-off passes are vectorized slice stores (odd multiples of i
+    are i*i, i*(i+2), ... - index (i*i)//2 with stride i). Starting each
+    pass at i*i is safe because smaller multiples were already crossed
+    off by smaller primes.
     """
-    if n < 2:
-        return []
-    
+    flags = np.ones(n // 2, dtype=np.bool_)
+    flags[0] = False  # 1 is not prime
+    for i in range(3, int(n**0.5) + 1, 2):
+        if flags[i // 2]:
+            flags[(i * i) // 2::i] = False
+    return flags
+
+# When numba is installed, replace the kernel with an LLVM-compiled
+# explicit loop: the JIT removes NumPy's per-slice dispatch overhead
+# (which dominates at small n) and autovectorizes the boolean stores.
+# The kernel is warmed at import so the first request doesn't pay the
+# compile; cache=True persists the compiled code across processes.
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _sieve_odds(n):
+        flags = np.ones(n // 2, dtype=np.bool_)
+        flags[0] = False
+        i = 3
+        while i * i < n:
+            if flags[i // 2]:
+                for j in range((i * i) // 2, n // 2, i):
+                    flags[j] = False
+            i += 2
+        return flags
+
+    _sieve_odds(3)
+except ImportError:
+    pass  # NumPy slice-store kernel above remains in use
+
+# A compiled Cython kernel is preferred over both Python kernels when it
+# has been built (see _primes.pyx / setup.py: python setup.py build_ext
+# --inplace). Its typed C loop runs with no interpreter dispatch at all.
+try:
+    from _primes import get_primes as _cy_get_primes
+except ImportError:
+    _cy_get_primes = None
+
+# With PRIMES_MAX set, the sieve up to that limit is computed once at
+# worker startup, packed to bits, and written to a file on /dev/shm
+# (tmpfs). Every worker then mmaps the same file read-only, so gunicorn
+# workers share one physical copy through the kernel page cache and
+# requests within the limit do zero sieving.
+_PRIMES_MAX = int(os.environ.get('PRIMES_MAX', '0'))
+_prime_bits = None
+
+def _packed_bits(n):
+    """
+    Primality flags for [0, n) packed to bits, LSB-first within each byte.
+
+    Bit i is set iff i is prime, so a client recovers the primes with
+    data[i >> 3] & (1 << (i & 7)). Built from the odds-only kernel and
+    packed by NumPy in one vectorized pass.
+    """
+    flags = np.zeros(n, dtype=np.bool_)
+    if n > 2:
+        flags[2] = True
+        flags[1::2] = _sieve_odds(n)  # odds-only kernel: flags[k] <=> 2k+1
+    return np.packbits(flags, bitorder='little').tobytes()
+
+def _write_prime_bitmap(path, limit):
+    """Sieve up to limit and write the primality flags as packed bits."""
+    with open(path, 'wb') as f:
+        f.write(_packed_bits(limit))
+
+if _PRIMES_MAX >= 3:
+    _bits_path = os.environ.get('PRIMES_BITS_PATH', '/dev/shm/primes.bits')
+    _bits_size = (_PRIMES_MAX + 7) // 8
+    if not os.path.exists(_bits_path) or os.path.getsize(_bits_path) != _bits_size:
+        _write_prime_bitmap(_bits_path, _PRIMES_MAX)
+    # The file object must outlive the mapping, so keep it module-level
+    _bits_file = open(_bits_path, 'rb')
+    _prime_bits = mmap.mmap(_bits_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+# Optional GPU path: mapping is-prime over a range is embarrassingly
+# parallel (one thread per candidate), so on machines with a CUDA device
+# a numba @vectorize ufunc can test thousands of candidates at once.
+# Gated on CUDA_VISIBLE_DEVICES so CPU-only deployments never pay the
+# kernel compile, and on numba/CUDA actually being usable.
+_gpu_is_prime = None
+if os.environ.get('CUDA_VISIBLE_DEVICES'):
+    try:
+        from numba import vectorize
+
+        @vectorize(['boolean(int64)'], target='cuda')
+        def _gpu_is_prime(num):
+            if num < 2:
+                return False
+            i = 2
+            while i * i <= num:
+                if num % i == 0:
+                    return False
+                i += 1
+            return True
+    except Exception:
+        # numba missing or CUDA toolkit/device unusable: stay on CPU
+        _gpu_is_prime = None
+
+# Above this size a single sieve pass is memory-bound and worth
+# splitting across cores; below it, process startup would dominate.
+_PARALLEL_THRESHOLD = 5_000_000
+_SEGMENT_SIZE = 1 << 20  # one segment's flags fit comfortably in L2
+
+def _sieve_segment(args):
+    """
+    Sieve one segment [lo, hi) and return the primes inside it.
+
+    args is a (lo, hi, small_primes) tuple (Pool.map passes one picklable
+    argument). small_primes holds every prime up to sqrt(n); each one
+    strikes its multiples from max(p*p, first multiple >= lo), which
+    also keeps p itself alive when it lies inside a low segment.
+    """
+    lo, hi, small_primes = args
+    flags = np.ones(hi - lo, dtype=np.bool_)
+    for p in small_primes:
+        start = max(p * p, ((lo + p - 1) // p) * p)
+        if start < hi:
+            flags[start - lo::p] = False
+    if lo == 0:
+        flags[:2] = False  # 0 and 1 are not prime
+    return (np.nonzero(flags)[0] + lo).tolist()
+
+def _get_primes_parallel(n):
+    """
+    Segmented, multi-process sieve for very large n.
+
+    Computes the primes up to sqrt(n) serially, then farms out fixed-size
+    segments to a process pool. Each worker only touches an L2-sized
+    slice of the range, so the normally memory-bound crossing-off passes
+    scale close to linearly with core count.
+    """
+    small = get_primes(int(n**0.5) + 1)
+    tasks = [
+        (lo, min(lo + _SEGMENT_SIZE, n), small)
+        for lo in range(0, n, _SEGMENT_SIZE)
+    ]
+    with multiprocessing.Pool() as pool:
+        segments = pool.map(_sieve_segment, tasks)
     primes = []
-    for num in range(2, n):
-        is_prime = True
-        for i in range(2, int(math.sqrt(num)) + 1):
-            if num % i == 0:
-                is_prime = False
-                break
-        if is_prime:
-            primes.append(num)
+    for segment in segments:
+        primes.extend(segment)
     return primes
 
+# Shared incremental sieve state, guarded by _sieve_lock. Instead of
+# re-sieving from 2 on every request, the largest sieve ever computed is
+# kept and only extended when a bigger n arrives; smaller requests are a
+# bisect slice of the cached prime list. Amortized over a request
+# stream, total sieve work is max(n) log log max(n) rather than the sum
+# over all requests.
+_sieve_lock = threading.Lock()
+_sieve_limit = 0                        # _flags covers numbers below this
+_flags = np.zeros(0, dtype=np.bool_)    # odds-only flags, as in _sieve_odds
+_primes_list = []                       # primes below _sieve_limit, ascending
+
+def _extend_sieve(n):
+    """
+    Grow the shared sieve to cover primes below n. Caller holds _sieve_lock.
+
+    The old flags array is copied into a larger one and only the new
+    range [old limit, n) is crossed off: composites below the old limit
+    were already marked, so each prime i only strikes its odd multiples
+    from max(i*i, old limit) upward.
+    """
+    global _sieve_limit, _flags, _primes_list
+    old_limit = _sieve_limit
+    if old_limit < 3:
+        # First build: use the (possibly JIT-compiled) kernel directly
+        flags = _sieve_odds(n)
+        primes = [2] + (2 * np.nonzero(flags)[0] + 1).tolist()
+    else:
+        flags = np.ones(n // 2, dtype=np.bool_)
+        flags[:_flags.shape[0]] = _flags
+        for i in range(3, int(n**0.5) + 1, 2):
+            if flags[i // 2]:
+                # First odd multiple of i that is >= max(i*i, old_limit)
+                m = max(i * i, ((old_limit + i - 1) // i) * i)
+                if m % 2 == 0:
+                    m += i
+                if m < n:
+                    flags[m // 2::i] = False
+        new_odd = np.nonzero(flags[old_limit // 2:])[0] + old_limit // 2
+        primes = _primes_list + (2 * new_odd + 1).tolist()
+    _flags = flags
+    _primes_list = primes
+    _sieve_limit = n
+
+def get_primes(n):
+    """
+    Returns a list of prime numbers below n using an odds-only sieve.
+
+    Evens other than 2 are never prime, so the sieve only tracks odd
+    candidates, halving the array and the memory traffic of the
+    crossing-off passes. Results come from a shared incremental sieve
+    that is extended in place when n exceeds anything seen before and
+    sliced (via bisect) when it doesn't.
+    """
+    if n < 3:
+        return []
+
+    if _prime_bits is not None and n <= _PRIMES_MAX:
+        # Zero-compute path: unpack the relevant prefix of the shared,
+        # mmap'd bitmap and read the prime indices straight out of it
+        packed = np.frombuffer(_prime_bits, dtype=np.uint8, count=(n + 7) // 8)
+        bits = np.unpackbits(packed, count=n, bitorder='little')
+        return np.nonzero(bits)[0].tolist()
+
+    if _gpu_is_prime is not None:
+        # One GPU thread per candidate; the ufunc handles the host
+        # transfers and the mask selects the primes back on the CPU
+        candidates = np.arange(2, n, dtype=np.int64)
+        return candidates[_gpu_is_prime(candidates)].tolist()
+
+    if n >= _PARALLEL_THRESHOLD:
+        return _get_primes_parallel(n)
+
+    if _cy_get_primes is not None:
+        return _cy_get_primes(n)
+
+    with _sieve_lock:
+        if n > _sieve_limit:
+            _extend_sieve(n)
+        # Primes strictly below n: everything left of the insertion point
+        return _primes_list[:bisect_left(_primes_list, n)]
+
+# Above this size, /api/primes streams its JSON instead of materializing
+# the full prime list and response string in memory at once, and results
+# are never memoized (64 pinned multi-hundred-MB tuples would dwarf the
+# cost of recomputing).
+_STREAM_THRESHOLD = 100_000
+
+@lru_cache(maxsize=64)
+def _get_primes_tuple(n):
+    """
+    Memoized prime list for the endpoints, as an immutable tuple.
+
+    Dashboards and polling clients tend to hit the same n repeatedly;
+    caching turns those repeats into a dict lookup instead of re-running
+    the sieve. The result is a tuple (not a list) so a cached value can
+    be handed to every caller without risk of mutation, and maxsize
+    bounds the entry count.
+    """
+    return tuple(get_primes(n))
+
+def _primes_payload(n):
+    """
+    Primes below n for a JSON response.
+
+    Small results come from the memoized tuple cache; results at or
+    above the streaming threshold are computed fresh so the lru_cache
+    never pins huge tuples in the worker for its lifetime (the count
+    bound alone doesn't limit bytes).
+    """
+    if n < _STREAM_THRESHOLD:
+        return _get_primes_tuple(n)
+    return get_primes(n)
+
+def _stream_primes_json(n):
+    """
+    Generate the /api/primes JSON body for large n, chunk by chunk.
+
+    Builds the odds-only flags array once, then walks it in 64K windows
+    with np.flatnonzero, yielding each window's primes as one
+    comma-joined fragment. Neither the full Python list of primes nor
+    the full response string ever exists at once, and the socket can
+    start sending while later windows are still being formatted.
+    """
+    flags = _sieve_odds(n)
+    count = int(flags.sum()) + 1  # odd primes plus 2
+    yield '{"limit":%d,"count":%d,"primes":[2' % (n, count)
+    chunk = 65536
+    for start in range(0, flags.shape[0], chunk):
+        idx = np.flatnonzero(flags[start:start + chunk])
+        if idx.size:
+            yield ',' + ','.join(map(str, (2 * (idx + start) + 1).tolist()))
+    yield ']}'
+
+def fastjson(obj):
+    """
+    Serialize obj to a JSON response, using orjson when available.
+
+    For big numeric payloads like prime lists this is the difference
+    between a C itoa loop and a per-element Python encoder; the response
+    body is identical either way.
+    """
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+# Responses smaller than this aren't worth the compression round-trip
+_GZIP_MIN_SIZE = 1024
+
+@app.after_request
+def _compress_response(response):
+    """
+    Gzip sizeable JSON bodies when the client accepts it.
+
+    Prime-list JSON is comma-separated ascii digits and compresses 3-5x,
+    so large responses are bandwidth-bound rather than compute-bound.
+    compresslevel=1 keeps the CPU cost negligible next to the sieve.
+    Scoped to JSON: the format=bits octet-stream is already packed and
+    shouldn't be touched. Streamed responses (unknown length) and small
+    bodies also pass through.
+    """
+    if (response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or response.content_length is None
+            or response.content_length < _GZIP_MIN_SIZE
+            or response.headers.get('Content-Encoding')
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    body = gzip.compress(response.get_data(), compresslevel=1)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Content-Length'] = len(body)
+    response.headers.add('Vary', 'Accept-Encoding')
+    return response
+
 @app.route('/')
 def index():
     """Render the home page with the calculator form."""
@@ -36,18 +361,37 @@ def api_primes():
     try:
         n = request.args.get('n', type=int)
         if n is None:
-            return jsonify({'error': 'Missing parameter: n'}), 400
+            return fastjson({'error': 'Missing parameter: n'}), 400
         if n < 2:
-            return jsonify({'error': 'Parameter n must be at least 2'}), 400
+            return fastjson({'error': 'Parameter n must be at least 2'}), 400
         
-        primes = get_primes(n)
-        return jsonify({
+        if request.args.get('format') == 'bits':
+            # Compact binary mode for programmatic clients: the packed
+            # bitmap is 24-48x smaller than the JSON list for large n,
+            # and the server skips list materialization and JSON
+            # encoding entirely (see readme.md for the decoder)
+            return Response(
+                _packed_bits(n),
+                mimetype='application/octet-stream',
+                headers={'X-Prime-Limit': str(n)}
+            )
+
+        if n >= _STREAM_THRESHOLD:
+            # Large results are streamed straight from the sieve bit
+            # array rather than built as one giant list and string
+            return Response(
+                stream_with_context(_stream_primes_json(n)),
+                mimetype='application/json'
+            )
+
+        primes = _primes_payload(n)
+        return fastjson({
             'limit': n,
             'count': len(primes),
             'primes': primes
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return fastjson({'error': str(e)}), 500
 
 @app.route('/calculate', methods=['POST'])
 def calculate():
@@ -60,21 +404,21 @@ def calculate():
         n = data.get('n')
         
         if n is None:
-            return jsonify({'error': 'Missing parameter: n'}), 400
+            return fastjson({'error': 'Missing parameter: n'}), 400
         if not isinstance(n, int):
-            return jsonify({'error': 'Parameter n must be an integer'}), 400
+            return fastjson({'error': 'Parameter n must be an integer'}), 400
         if n < 2:
-            return jsonify({'error': 'Parameter n must be at least 2'}), 400
+            return fastjson({'error': 'Parameter n must be at least 2'}), 400
         
-        primes = get_primes(n)
-        return jsonify({
+        primes = _primes_payload(n)
+        return fastjson({
             'limit': n,
             'count': len(primes),
             'primes': primes,
             'success': True
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return fastjson({'error': str(e)}), 500
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
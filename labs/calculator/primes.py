@@ -1,45 +1,37 @@
-#find prime numbers less 100
+#find prime numbers below a given n
+#
+#consolidated from the earlier prompt/loop blocks: one reusable function,
+#no input() calls at import time, so app.py and tests can import this
+#module without hanging on stdin or re-running the same loop three times
 
-for num in range(2, 100):
-    prime = True
-    for i in range(2, num):
-        if num % i == 0:
-            prime = False
-            break
-    if prime:
-        print(num)  
+def primes_up_to(n):
+    """
+    Return the list of primes strictly below n.
 
+    Odd-skip trial division: 2 is special-cased, then only odd
+    candidates are tested against odd divisors. The inner loop bounds
+    itself with i*i <= num, so no square root - integer or float - is
+    computed per candidate; one extra multiply per divisor is cheaper
+    than a per-candidate isqrt call and lets the loop exit early.
+    """
+    if n <= 2:
+        return []
+    primes = [2]
+    for num in range(3, n, 2):
+        prime = True
+        i = 3
+        while i * i <= num:
+            if num % i == 0:
+                prime = False
+                break
+            i += 2
+        if prime:
+            primes.append(num)
+    return primes
 
 
-#now for a given n
-
-n = int(input("Enter a number: "))
-for num in range(2, n):
-    prime = True
-    for i in range(2, num):
-        if num % i == 0:
-            prime = False
-            break
-    if prime:
-        print(num)
-
-#optimized version for a given n
-n = int(input("Enter a number: "))
-for num in range(2, n):
-    prime = True
-    for i in range(2, int(num**0.5) + 1):
-        if num % i == 0:
-            prime = False
-            break
-    if prime:
-        print(num)
-#optimized version for a given n
-n = int(input("Enter a number: "))
-for num in range(2, n):
-    prime = True
-    for i in range(2, int(num**0.5) + 1):
-        if num % i == 0:
-            prime = False
-            break
-    if prime:
-        print(num)
\ No newline at end of file
+if __name__ == "__main__":
+    #demo: first the fixed range, then a user-supplied limit
+    print(*primes_up_to(100), sep="\n")
+    n = int(input("Enter a number: "))
+    print(*primes_up_to(n), sep="\n")
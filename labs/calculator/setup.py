@@ -0,0 +1,20 @@
+"""
+Build script for the optional Cython sieve extension.
+
+Usage:
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+app.py picks up the compiled _primes module automatically when present.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="calculator-primes",
+    ext_modules=cythonize(
+        "_primes.pyx",
+        compiler_directives={"language_level": 3},
+    ),
+)
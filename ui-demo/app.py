@@ -18,6 +18,7 @@ Usage:
 """
 
 import streamlit as st
+from langchain_core.messages import AIMessageChunk
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from tools import fake_search, summarize_csv
@@ -47,16 +48,73 @@ os.environ['OPENAI_API_KEY'] = api_key
 # ============================================================================
 # Agent Setup
 # ============================================================================
-# Initialize the language model (GPT-4o-mini is cost-effective and fast)
-llm = ChatOpenAI(model="gpt-4o-mini")
+# Streamlit reruns this whole script on every widget interaction, so
+# building the model client and agent at the top level would redo the
+# HTTPX client setup, tool schema binding, and LangGraph construction on
+# every button click. cache_resource builds them exactly once per process.
+@st.cache_resource
+def get_agent():
+    """
+    Build the ReAct agent once per process and reuse it across reruns.
 
-# Define the list of tools available to the agent
-# These tools extend the agent's capabilities beyond just text generation
-tools = [fake_search, summarize_csv]
+    Returns:
+        The compiled LangGraph agent with the demo tools bound
+    """
+    # Initialize the language model (GPT-4o-mini is cost-effective and fast)
+    llm = ChatOpenAI(model="gpt-4o-mini")
 
-# Create a ReAct (Reasoning + Acting) agent
-# This agent can reason about which tools to use and execute them
-agent = create_react_agent(llm, tools)
+    # Define the list of tools available to the agent
+    # These tools extend the agent's capabilities beyond just text generation
+    tools = [fake_search, summarize_csv]
+
+    # Create a ReAct (Reasoning + Acting) agent
+    # This agent can reason about which tools to use and execute them
+    return create_react_agent(llm, tools)
+
+
+@st.cache_resource
+def _answer_cache() -> dict:
+    """Process-wide memo of finished answers, keyed by question text."""
+    return {}
+
+
+def run_agent(question: str):
+    """
+    Stream the agent's tokens for a question, memoizing the final answer.
+
+    Yields token text as the model produces it, so st.write_stream can
+    paint the response at first-token latency instead of blocking on the
+    whole completion. Identical prompts replay the finished answer from
+    the cache without an API round-trip.
+
+    Args:
+        question (str): The user's question
+
+    Yields:
+        str: Incremental response text
+    """
+    cache = _answer_cache()
+    if question in cache:
+        yield cache[question]
+        return
+
+    parts = []
+    # stream_mode="messages" yields (message_chunk, metadata) pairs for
+    # every message the graph produces - including ToolMessage outputs
+    # (raw search results, whole CSV describe tables). Only LLM token
+    # chunks belong in the displayed/cached answer, matching what the
+    # old invoke path showed (the final assistant message).
+    for chunk, _meta in get_agent().stream(
+        {"messages": [("user", question)]},
+        stream_mode="messages",
+    ):
+        if not isinstance(chunk, AIMessageChunk):
+            continue
+        text = chunk.content
+        if text:
+            parts.append(text)
+            yield text
+    cache[question] = "".join(parts)
 
 # ============================================================================
 # User Interface
@@ -71,16 +129,11 @@ user_input = st.text_input(
 if st.button("Run Agent"):
     # Only process if the user has entered something
     if user_input.strip():
-        # Display a spinner while the agent is processing
-        with st.spinner("Agent thinking..."):
-            # Invoke the agent with the user's message
-            # The agent will decide which tools (if any) to use
-            result = agent.invoke({"messages": [("user", user_input)]})
-        
-        # Display the agent's response
+        # Stream the agent's response as it is produced; the user sees
+        # the first token in ~hundreds of ms instead of waiting for the
+        # full completion and all tool calls to finish
         st.success("Agent Response:")
-        # Extract the final message from the agent's response
-        st.write(result["messages"][-1].content)
+        st.write_stream(run_agent(user_input))
     else:
         st.error("Please enter a question before running the agent.")
 
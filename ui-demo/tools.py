@@ -9,9 +9,35 @@ Tools available:
 - summarize_csv: Loads and provides statistical summary of CSV files
 """
 
+import os
+from functools import lru_cache
+
 from langchain.tools import tool
 import pandas as pd
 
+# pyarrow's CSV reader is a multi-threaded C++ parser, far faster than
+# pandas' own on large files. It's optional: when it isn't installed,
+# summarize_csv simply parses with pandas as before.
+try:
+    import pyarrow.csv as _pacsv
+except ImportError:
+    _pacsv = None
+
+
+def _read_csv(path: str) -> pd.DataFrame:
+    """
+    Read a CSV into a DataFrame, preferring pyarrow's parallel parser.
+
+    With pyarrow present the file is parsed by its multi-threaded C++
+    reader and only then converted to pandas; without it, pd.read_csv
+    is used directly. Either way the caller gets an ordinary DataFrame.
+    """
+    if _pacsv is not None:
+        return _pacsv.read_csv(
+            path, read_options=_pacsv.ReadOptions(use_threads=True)
+        ).to_pandas()
+    return pd.read_csv(path)
+
 
 @tool
 def fake_search(query: str) -> str:
@@ -35,6 +61,19 @@ def fake_search(query: str) -> str:
     return f"Search results for '{query}': A, B, and C."
 
 
+@lru_cache(maxsize=32)
+def _summarize_cached(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Parse and describe one CSV, memoized on the file's identity.
+
+    The agent often calls summarize_csv repeatedly on the same file
+    within a session; keying the cache on (path, mtime_ns, size) makes
+    repeat calls a dict lookup while still re-parsing automatically
+    whenever the file changes on disk (the stat key changes with it).
+    """
+    return _read_csv(path).describe().to_string()
+
+
 @tool
 def summarize_csv(path: str) -> str:
     """
@@ -60,8 +99,7 @@ def summarize_csv(path: str) -> str:
         mean      50.5       75.2
         ..."
     """
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(path)
-    
-    # Generate descriptive statistics and convert to string format
-    return df.describe().to_string()
+    # Stat first so the cache key tracks the file's current contents;
+    # the parse + describe runs only when (path, mtime, size) is new
+    stat = os.stat(path)
+    return _summarize_cached(path, stat.st_mtime_ns, stat.st_size)